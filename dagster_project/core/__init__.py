@@ -8,16 +8,19 @@ from .schedules import *
 from .sensors import *
 from resources import sql_io_manager
 
-all_assets = [*core_database_assets]
+all_assets = [*core_database_assets, *core_fastf1_cache_assets]
 
 defs = Definitions(
     assets=all_assets,
     jobs=[
         mysql_daily_backup_job,
-        mysql_restore_job
+        mysql_restore_job,
+        swap_table_restore_job,
+        fastf1_cache_eviction_job
     ],
     schedules=[
-        mysql_daily_backup_schedule
+        mysql_daily_backup_schedule,
+        fastf1_cache_eviction_schedule
     ],
     sensors=[discord_failure_sensor],
     resources={
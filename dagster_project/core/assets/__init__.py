@@ -1,6 +1,11 @@
 from dagster import load_assets_from_package_module, load_assets_from_modules
 from .database import *
+from .fastf1_cache import *
 
 DATABASE = "database"
 core_database_assets = load_assets_from_package_module(package_module=database,
                                                        group_name=DATABASE)
+
+FASTF1_CACHE = "fastf1_cache"
+core_fastf1_cache_assets = load_assets_from_package_module(package_module=fastf1_cache,
+                                                           group_name=FASTF1_CACHE)
@@ -35,4 +35,19 @@ def database_backup_restore(context: AssetExecutionContext,
     if not os.path.isfile(backup_file):
         raise Exception(f"Error: Backup file '{backup_file}' has not been created.")
 
-    return
\ No newline at end of file
+    return
+
+
+@asset(required_resource_keys={'sql_io_manager'},
+       config_schema={'schema': str,
+                      'table': str})
+def swap_table_restore(context: AssetExecutionContext):
+    schema = context.op_config['schema']
+    table = context.op_config['table']
+
+    # Tables written in swap mode keep the copy they replaced, this puts it back after a bad load
+    context.log.info(f'Restoring the previous copy of {schema}.{table}')
+    context.resources.sql_io_manager.restore_previous_copy(schema=schema, table=table)
+    context.log.info(f'Restored {schema}.{table}, the replaced copy is now the previous copy')
+
+    return
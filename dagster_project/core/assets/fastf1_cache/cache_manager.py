@@ -0,0 +1,92 @@
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from filelock import Timeout
+from resources.fast_f1_cache import FastF1CacheIndex
+from resources.fast_f1_cache_store import PackedCacheStore
+
+cache_loc = os.getenv('FAST_F1_CACHE_LOC')
+
+
+@asset(config_schema={'quota_gb': float,
+                      'pin_days': int})
+def fastf1_cache_eviction(context: AssetExecutionContext):
+    quota_bytes = int(context.op_config['quota_gb'] * 1024 ** 3)
+    pin_days = context.op_config['pin_days']
+
+    cache_index = FastF1CacheIndex(cache_loc)
+    hit_ratio = cache_index.hit_ratio()
+
+    # The current season and anything used recently are never evicted
+    pinned_seasons = [datetime.utcnow().year]
+    pinned_since = datetime.utcnow() - timedelta(days=pin_days)
+
+    context.log.info(f'Enforcing a {context.op_config["quota_gb"]}GB quota on {cache_loc}, '
+                     f'pinning {pinned_seasons} and sessions used since {pinned_since}')
+
+    index, evicted = cache_index.enforce_quota(quota_bytes=quota_bytes,
+                                               pinned_seasons=pinned_seasons,
+                                               pinned_since=pinned_since)
+
+    for row in evicted.itertuples():
+        context.log.info(f'Evicted {row.SEASON} - {row.EVENT} - {row.SESSION_TYPE} ({row.SIZE_BYTES} bytes)')
+
+    size_before = int(index['SIZE_BYTES'].sum())
+    reclaimed = int(evicted['SIZE_BYTES'].sum())
+
+    return Output(value=evicted,
+                  metadata={
+                      'Markdown': MetadataValue.md(evicted.head().to_markdown()),
+                      'Sessions Cached': len(index) - len(evicted),
+                      'Sessions Evicted': len(evicted),
+                      'Cache Size Before (MB)': round(size_before / 1024 ** 2, 1),
+                      'Cache Size After (MB)': round((size_before - reclaimed) / 1024 ** 2, 1),
+                      'Bytes Reclaimed': reclaimed,
+                      'Cache Hit Ratio': hit_ratio}
+                  )
+
+
+@asset(deps=[fastf1_cache_eviction],
+       config_schema={'pack_idle_days': int,
+                      'zstd_level': int})
+def fastf1_cache_pack(context: AssetExecutionContext):
+    pack_idle_days = context.op_config['pack_idle_days']
+    store = PackedCacheStore(cache_loc, level=context.op_config['zstd_level'])
+
+    # 0 turns packing off, packed sessions are rehydrated by the FastF1 resources the next time they are loaded
+    packed = list()
+    if pack_idle_days > 0:
+        idle_since = datetime.utcnow() - timedelta(days=pack_idle_days)
+        index = FastF1CacheIndex(cache_loc).index()
+        idle = index.loc[(index['SEASON'] != datetime.utcnow().year) & (index['LAST_ACCESS'] < idle_since)]
+
+        context.log.info(f'Packing {len(idle)} sessions not used since {idle_since}')
+
+        for row in idle.itertuples():
+            try:
+                stats = store.pack(row.PATH)
+            except Timeout:
+                context.log.info(f'Skipped {row.SEASON} - {row.EVENT} - {row.SESSION_TYPE} as it is being loaded')
+                continue
+            packed.append({'SEASON': row.SEASON,
+                           'EVENT': row.EVENT,
+                           'SESSION_TYPE': row.SESSION_TYPE,
+                           'RAW_BYTES': stats['raw_bytes'],
+                           'WRITTEN_BYTES': stats['written_bytes']})
+
+    freed = store.collect_garbage()
+    footprint = store.footprint()
+    packed = pd.DataFrame(packed, columns=['SEASON', 'EVENT', 'SESSION_TYPE', 'RAW_BYTES', 'WRITTEN_BYTES'])
+
+    return Output(value=packed,
+                  metadata={
+                      'Markdown': MetadataValue.md(packed.head().to_markdown()),
+                      'Sessions Packed': len(packed),
+                      'Packed Sessions Total': footprint['packed_sessions'],
+                      'Raw Size (MB)': round(footprint['raw_bytes'] / 1024 ** 2, 1),
+                      'Deduplicated Size (MB)': round(footprint['deduplicated_bytes'] / 1024 ** 2, 1),
+                      'Stored Size (MB)': round(footprint['stored_bytes'] / 1024 ** 2, 1),
+                      'Compression Ratio': footprint['compression_ratio'],
+                      'Orphan Blob Bytes Freed': freed}
+                  )
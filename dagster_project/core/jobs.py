@@ -7,6 +7,7 @@ from .assets.database import database_restore
 from .partitions import daily_partitions
 from .assets.database.database_backup import *
 from .assets.database.database_restore import *
+from .assets.fastf1_cache.cache_manager import *
 
 backup_dir = os.getenv('BACKUP_DIR')
 
@@ -32,3 +33,30 @@ mysql_restore_job = define_asset_job('mysql_restore_job',
                                                       {"config":
                                                            {'backup_file': ''}}}}
                                      )
+
+swap_table_restore_job = define_asset_job('swap_table_restore_job',
+                                          selection=AssetSelection.assets(swap_table_restore),
+                                          description='Job to put back the previous copy of a table written in swap '
+                                                      'mode, running it again undoes the restore',
+                                          config={'ops':
+                                                      {'swap_table_restore':
+                                                           {"config":
+                                                                {'schema': 'SESSION',
+                                                                 'table': 'RACE_LAPS'}}}}
+                                          )
+
+fastf1_cache_eviction_job = define_asset_job('fastf1_cache_eviction_job',
+                                             selection=AssetSelection.assets(fastf1_cache_eviction,
+                                                                             fastf1_cache_pack),
+                                             description='Job to index the FastF1 cache, evict the least recently '
+                                                         'used sessions once it is over quota and pack idle sessions',
+                                             config={'ops':
+                                                         {'fastf1_cache_eviction':
+                                                              {"config":
+                                                                   {'quota_gb': 20.0,
+                                                                    'pin_days': 14}},
+                                                          'fastf1_cache_pack':
+                                                              {"config":
+                                                                   {'pack_idle_days': 0,
+                                                                    'zstd_level': 10}}}}
+                                             )
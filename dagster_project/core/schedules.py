@@ -19,3 +19,8 @@ mysql_daily_backup_schedule = ScheduleDefinition(name='mysql_daily_backup_schedu
                                                                        {'type': 'auto'}
                                                                    }}}
                                                  )
+
+fastf1_cache_eviction_schedule = ScheduleDefinition(name='fastf1_cache_eviction_schedule',
+                                                    job=fastf1_cache_eviction_job,
+                                                    cron_schedule='0 3 * * 1',
+                                                    execution_timezone='Europe/London')
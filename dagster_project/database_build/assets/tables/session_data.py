@@ -47,6 +47,26 @@ def create_race_laps_data(context):
     context.log.info(f'Query to run: \n{query}')
     con = MySQLDirectConnection(port, database, user, password, server)
     df = con.run_query_no_output(query=query)
+    return Output(
+        value=df
+    )
+
+@asset()
+def create_practice_laps_data(context):
+    query = FileUtils.file_to_query('create_practice_laps_data_table')
+    context.log.info(f'Query to run: \n{query}')
+    con = MySQLDirectConnection(port, database, user, password, server)
+    df = con.run_query_no_output(query=query)
+    return Output(
+        value=df
+    )
+
+@asset()
+def create_qualifying_laps_data(context):
+    query = FileUtils.file_to_query('create_qualifying_laps_data_table')
+    context.log.info(f'Query to run: \n{query}')
+    con = MySQLDirectConnection(port, database, user, password, server)
+    df = con.run_query_no_output(query=query)
     return Output(
         value=df
     )
\ No newline at end of file
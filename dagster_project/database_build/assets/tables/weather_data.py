@@ -27,6 +27,16 @@ def create_weather_historic(context):
     context.log.info(f'Query to run: \n{query}')
     con = MySQLDirectConnection(port, database, user, password, server)
     df = con.run_query_no_output(query=query)
+    return Output(
+        value=df
+    )
+
+@asset()
+def create_session_weather(context):
+    query = FileUtils.file_to_query('create_session_weather')
+    context.log.info(f'Query to run: \n{query}')
+    con = MySQLDirectConnection(port, database, user, password, server)
+    df = con.run_query_no_output(query=query)
     return Output(
         value=df
     )
\ No newline at end of file
@@ -1,6 +1,5 @@
 from dagster import (Definitions, ResourceDefinition)
-from dagster_mysql import MySQLResource
-from resources import sql_io_manager, jolpi_api, fast_f1_resource
+from resources import sql_io_manager, jolpi_api, fast_f1_resource, mysql_pool
 
 from .assets import *
 from .jobs import *
@@ -32,7 +31,7 @@ defs = Definitions(
             port=os.getenv('SQL_PORT'),
             server=os.getenv('SQL_SERVER'),
         ),
-        'mysql': MySQLResource(
+        'mysql': mysql_pool.MySQLPoolResource(
             user=os.getenv('SQL_USER'),
             password=os.getenv('SQL_PASSWORD'),
             port=os.getenv('SQL_PORT'),
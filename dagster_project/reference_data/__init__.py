@@ -1,11 +1,10 @@
 import os
 from dagster import (Definitions, ResourceDefinition)
-from dagster_mysql import MySQLResource
 from .assets import *
 from .jobs import *
 from .schedules import *
 from .sensors import *
-from resources import sql_io_manager, jolpi_api, fast_f1_resource
+from resources import sql_io_manager, jolpi_api, fast_f1_resource, mysql_pool
 
 all_assets = [*api_update_assets, *file_update_assets]
 
@@ -39,7 +38,7 @@ defs = Definitions(
             port=os.getenv('SQL_PORT'),
             server=os.getenv('SQL_SERVER'),
         ),
-        'mysql': MySQLResource(
+        'mysql': mysql_pool.MySQLPoolResource(
             user=os.getenv('SQL_USER'),
             password=os.getenv('SQL_PASSWORD'),
             port=os.getenv('SQL_PORT'),
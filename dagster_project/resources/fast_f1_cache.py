@@ -0,0 +1,136 @@
+import os
+import shutil
+import pandas as pd
+from datetime import datetime
+from filelock import FileLock, Timeout
+
+ACCESS_LOG = 'fastf1_cache_access.csv'
+ACCESS_MARKER = '.last_access'
+# Load profiles whose api data has been downloaded into a session folder, one per line
+PROFILE_MARKER = '.loaded_profiles'
+LOCK_DIR = '.locks'
+
+
+class FastF1CacheIndex:
+
+    def __init__(self, cache_loc: str):
+        self.cache_loc = cache_loc
+
+    def session_dir(self, api_path: str) -> str:
+        # FastF1 mirrors the live timing api path, without the /static prefix, inside the cache directory
+        parts = [x for x in api_path.split('/') if x and x != 'static']
+        return os.path.join(self.cache_loc, *parts)
+
+    def dir_lock(self, session_dir: str) -> FileLock:
+        # Locks live outside the session folder so evicting the folder never deletes a lock someone is waiting on
+        name = os.path.relpath(session_dir, self.cache_loc).replace(os.sep, '__')
+        os.makedirs(os.path.join(self.cache_loc, LOCK_DIR), exist_ok=True)
+        return FileLock(os.path.join(self.cache_loc, LOCK_DIR, f'{name}.lock'))
+
+    def session_lock(self, api_path: str) -> FileLock:
+        return self.dir_lock(self.session_dir(api_path))
+
+    def loaded_profiles(self, api_path: str) -> set:
+        path = os.path.join(self.session_dir(api_path), PROFILE_MARKER)
+        if not os.path.isfile(path):
+            return set()
+        with open(path) as file:
+            return {line.strip() for line in file if line.strip()}
+
+    def record_profile(self, api_path: str, profile: str):
+        # Called with the session lock held, so appends from different processes never interleave
+        session_dir = self.session_dir(api_path)
+        if not os.path.isdir(session_dir) or profile in self.loaded_profiles(api_path):
+            return
+        with open(os.path.join(session_dir, PROFILE_MARKER), 'a') as file:
+            file.write(f'{profile}\n')
+
+    def record_access(self, api_path: str, hit: bool):
+        session_dir = self.session_dir(api_path)
+        if os.path.isdir(session_dir):
+            with open(os.path.join(session_dir, ACCESS_MARKER), 'w') as file:
+                file.write(datetime.utcnow().isoformat())
+        with open(os.path.join(self.cache_loc, ACCESS_LOG), 'a') as file:
+            file.write(f'{datetime.utcnow().isoformat()},{api_path},{int(hit)}\n')
+
+    def hit_ratio(self, reset: bool = True) -> float:
+        log_path = os.path.join(self.cache_loc, ACCESS_LOG)
+        if not os.path.isfile(log_path):
+            return 0.0
+        if reset:
+            # Move the log aside first so loads running now start a new log instead of being lost
+            read_path = log_path + '.reading'
+            os.replace(log_path, read_path)
+        else:
+            read_path = log_path
+        log = pd.read_csv(read_path, names=['ACCESS_TS', 'API_PATH', 'HIT'])
+        if reset:
+            os.remove(read_path)
+        return round(log['HIT'].mean(), 3) if len(log) else 0.0
+
+    @staticmethod
+    def _dir_stats(path: str):
+        size = 0
+        last_access = 0.0
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                stat = os.stat(os.path.join(root, name))
+                size += stat.st_size
+                last_access = max(last_access, stat.st_atime, stat.st_mtime)
+        return size, datetime.utcfromtimestamp(last_access)
+
+    def index(self) -> pd.DataFrame:
+        rows = list()
+        # Sessions are cached as <cache>/<season>/<event>/<session>/
+        for season in os.listdir(self.cache_loc):
+            season_dir = os.path.join(self.cache_loc, season)
+            if not (season.isdigit() and os.path.isdir(season_dir)):
+                continue
+            for event in os.listdir(season_dir):
+                event_dir = os.path.join(season_dir, event)
+                if not os.path.isdir(event_dir):
+                    continue
+                for session in os.listdir(event_dir):
+                    session_dir = os.path.join(event_dir, session)
+                    if not os.path.isdir(session_dir):
+                        continue
+                    size, last_access = self._dir_stats(session_dir)
+                    rows.append({'PATH': session_dir,
+                                 'SEASON': int(season),
+                                 'EVENT': event.split('_', 1)[-1].replace('_', ' '),
+                                 'SESSION_TYPE': session.split('_', 1)[-1].replace('_', ' '),
+                                 'SIZE_BYTES': size,
+                                 'LAST_ACCESS': last_access})
+
+        return pd.DataFrame(rows, columns=['PATH', 'SEASON', 'EVENT', 'SESSION_TYPE', 'SIZE_BYTES', 'LAST_ACCESS'])
+
+    def enforce_quota(self,
+                      quota_bytes: int,
+                      pinned_seasons: list,
+                      pinned_since: datetime):
+        index = self.index()
+        pinned = index['SEASON'].isin(pinned_seasons) | (index['LAST_ACCESS'] >= pinned_since)
+        total = int(index['SIZE_BYTES'].sum())
+
+        evicted = list()
+        for row in index.loc[~pinned].sort_values(by='LAST_ACCESS').itertuples():
+            if total <= quota_bytes:
+                break
+            # Sessions that are being loaded right now are skipped rather than waited on
+            lock = self.dir_lock(row.PATH)
+            try:
+                lock.acquire(timeout=0)
+            except Timeout:
+                continue
+            try:
+                shutil.rmtree(row.PATH, ignore_errors=True)
+            finally:
+                lock.release()
+            total -= row.SIZE_BYTES
+            evicted.append(row.Index)
+
+            event_dir = os.path.dirname(row.PATH)
+            if not os.listdir(event_dir):
+                os.rmdir(event_dir)
+
+        return index, index.loc[evicted]
@@ -0,0 +1,144 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from resources.fast_f1_cache import FastF1CacheIndex
+
+PACKED_DIR = '.packed'
+BLOB_DIR = 'blobs'
+MANIFEST_DIR = 'manifests'
+
+
+def _zstd():
+    # Only needed when the packed store is in use, so it is not a hard dependency of the FastF1 resource
+    try:
+        import zstandard
+    except ImportError as err:
+        raise ImportError('zstandard is required for the packed FastF1 cache, install it with pip install zstandard') \
+            from err
+    return zstandard
+
+
+class PackedCacheStore:
+
+    def __init__(self, cache_loc: str, level: int = 10):
+        self.cache_index = FastF1CacheIndex(cache_loc)
+        self.root = os.path.join(cache_loc, PACKED_DIR)
+        self.level = level
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, BLOB_DIR, digest[:2], f'{digest}.zst')
+
+    def _manifest_path(self, session_dir: str) -> str:
+        rel_path = os.path.relpath(session_dir, self.cache_index.cache_loc)
+        return os.path.join(self.root, MANIFEST_DIR, f'{rel_path}.json')
+
+    def _manifests(self):
+        for root, dirs, files in os.walk(os.path.join(self.root, MANIFEST_DIR)):
+            for name in files:
+                if name.endswith('.json'):
+                    with open(os.path.join(root, name)) as file:
+                        yield json.load(file)
+
+    def is_packed(self, session_dir: str) -> bool:
+        return os.path.isfile(self._manifest_path(session_dir))
+
+    def pack(self, session_dir: str) -> dict:
+        compressor = _zstd().ZstdCompressor(level=self.level)
+
+        with self.cache_index.dir_lock(session_dir).acquire(timeout=0):
+            files = dict()
+            raw_bytes = 0
+            written_bytes = 0
+            for root, dirs, names in os.walk(session_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    with open(path, 'rb') as file:
+                        data = file.read()
+
+                    # Blobs are named by their content, so a payload shared by several sessions is only stored once
+                    digest = hashlib.sha256(data).hexdigest()
+                    blob_path = self._blob_path(digest)
+                    if not os.path.isfile(blob_path):
+                        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                        tmp_path = blob_path + '.tmp'
+                        with open(tmp_path, 'wb') as file:
+                            file.write(compressor.compress(data))
+                        os.replace(tmp_path, blob_path)
+                        written_bytes += os.path.getsize(blob_path)
+
+                    files[os.path.relpath(path, session_dir)] = {'sha256': digest,
+                                                                 'size': len(data),
+                                                                 'mtime': os.stat(path).st_mtime}
+                    raw_bytes += len(data)
+
+            manifest_path = self._manifest_path(session_dir)
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            tmp_path = manifest_path + '.tmp'
+            with open(tmp_path, 'w') as file:
+                json.dump({'session_dir': os.path.relpath(session_dir, self.cache_index.cache_loc),
+                           'packed_ts': datetime.utcnow().isoformat(),
+                           'files': files}, file)
+            os.replace(tmp_path, manifest_path)
+
+            # The manifest is written before the folder is removed, so a crash never loses a session
+            shutil.rmtree(session_dir)
+
+        return {'files': len(files), 'raw_bytes': raw_bytes, 'written_bytes': written_bytes}
+
+    def unpack(self, session_dir: str) -> bool:
+        # Called with the session lock already held by the loader
+        manifest_path = self._manifest_path(session_dir)
+        if not os.path.isfile(manifest_path):
+            return False
+
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+        decompressor = _zstd().ZstdDecompressor()
+        for rel_path, entry in manifest['files'].items():
+            path = os.path.join(session_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(self._blob_path(entry['sha256']), 'rb') as file:
+                data = decompressor.decompress(file.read())
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+            os.utime(path, (entry['mtime'], entry['mtime']))
+
+        os.remove(manifest_path)
+        return True
+
+    def collect_garbage(self) -> int:
+        referenced = {entry['sha256'] for manifest in self._manifests() for entry in manifest['files'].values()}
+
+        freed = 0
+        for root, dirs, files in os.walk(os.path.join(self.root, BLOB_DIR)):
+            for name in files:
+                if name.endswith('.zst') and name[:-4] not in referenced:
+                    path = os.path.join(root, name)
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+        return freed
+
+    def footprint(self) -> dict:
+        sessions = 0
+        raw_bytes = 0
+        unique = dict()
+        for manifest in self._manifests():
+            sessions += 1
+            for entry in manifest['files'].values():
+                raw_bytes += entry['size']
+                unique[entry['sha256']] = entry['size']
+
+        blob_bytes = 0
+        for root, dirs, files in os.walk(os.path.join(self.root, BLOB_DIR)):
+            blob_bytes += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+
+        return {'packed_sessions': sessions,
+                'raw_bytes': raw_bytes,
+                'deduplicated_bytes': sum(unique.values()),
+                'stored_bytes': blob_bytes,
+                'compression_ratio': round(raw_bytes / blob_bytes, 2) if blob_bytes else 0.0}
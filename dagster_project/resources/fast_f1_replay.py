@@ -0,0 +1,179 @@
+import os
+import json
+import random
+import time
+import pandas as pd
+from typing import Iterable, Literal, Optional
+
+
+class ReplayArchive:
+
+    def __init__(self, archive_loc: str):
+        self.archive_loc = archive_loc
+
+    def path(self, method: str, **key) -> str:
+        file_name = '_'.join(f'{k}={key[k]}' for k in sorted(key))
+        return os.path.join(self.archive_loc, method, f'{file_name}.pkl')
+
+    def record(self, df: pd.DataFrame, method: str, latency_ms: Optional[float] = None, **key):
+        path = self.path(method, **key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        pd.DataFrame(df).to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        if latency_ms is not None:
+            with open(tmp_path, 'w') as file:
+                json.dump({'latency_ms': latency_ms}, file)
+            os.replace(tmp_path, self._latency_path(path))
+
+    def record_parts(self, chunks: Iterable[pd.DataFrame], method: str, **key):
+        # Streams are recorded chunk by chunk and only marked complete once the last chunk has been written
+        parts = 0
+        start = time.perf_counter()
+        for chunk in chunks:
+            self.record(chunk, method, latency_ms=(time.perf_counter() - start) * 1000, part=parts, **key)
+            parts += 1
+            yield chunk
+            start = time.perf_counter()
+        self.record(pd.DataFrame({'parts': [parts]}), method, **key)
+
+    @staticmethod
+    def _latency_path(path: str) -> str:
+        return path[:-len('.pkl')] + '.latency.json'
+
+    def latency_ms(self, method: str, **key) -> Optional[float]:
+        path = self._latency_path(self.path(method, **key))
+        if not os.path.isfile(path):
+            return None
+        with open(path) as file:
+            return json.load(file)['latency_ms']
+
+    def replay(self, method: str, **key) -> pd.DataFrame:
+        path = self.path(method, **key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'No recording for {method} {key} in {self.archive_loc}, '
+                                    f'run with mode record against the live API first')
+        return pd.read_pickle(path)
+
+
+class FastF1ReplayClient:
+
+    def __init__(self,
+                 archive: ReplayArchive,
+                 latency_ms: Optional[float] = None,
+                 latency_scale: float = 1.0,
+                 jitter_ms: float = 0.0,
+                 seed: int = 0):
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.latency_scale = latency_scale
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+
+    def _replay(self, method: str, **key) -> pd.DataFrame:
+        df = self.archive.replay(method, **key)
+        # The latency measured while recording is replayed times latency_scale, latency_ms overrides it for every
+        # call. Jitter is seeded per recording so replays are deterministic regardless of call order
+        if self.latency_ms is not None:
+            latency_ms = self.latency_ms
+        else:
+            latency_ms = (self.archive.latency_ms(method, **key) or 0.0) * self.latency_scale
+        rng = random.Random(f'{self.seed}-{self.archive.path(method, **key)}')
+        delay = max(0.0, rng.gauss(latency_ms, self.jitter_ms)) if self.jitter_ms else latency_ms
+        time.sleep(delay / 1000)
+        return df
+
+    def probe_session(self,
+                      year: int,
+                      round_number: int,
+                      identifier: str) -> dict:
+        probe = self._replay('probe_session', **session_key(year, round_number, identifier)).iloc[0]
+        return {'drivers': int(probe['drivers']),
+                'laps': bool(probe['laps']),
+                'timing_complete': bool(probe['timing_complete'])}
+
+    def warm_cache(self,
+                   year: int,
+                   round_number: int,
+                   session: str) -> list:
+        return list(self._replay('warm_cache', **session_key(year, round_number, session))['warmed'])
+
+    def get_session_list(self,
+                         year: int,
+                         round_number: int) -> list:
+        return list(self._replay('get_session_list', **event_key(year, round_number))['sessions'])
+
+    def iter_lap_telemetry(self,
+                           year: int,
+                           round_number: int,
+                           identifier: str,
+                           grid: Literal['distance', 'time'] = 'distance',
+                           step: float = 10.0):
+        key = telemetry_key(year, round_number, identifier, grid, step)
+        parts = int(self._replay('iter_lap_telemetry', **key)['parts'].iloc[0])
+        for part in range(parts):
+            yield self._replay('iter_lap_telemetry', part=part, **key)
+
+    def get_practice_results(self,
+                             year: int,
+                             round_number: int,
+                             practice_num: Literal[1, 2, 3, None] = None,
+                             drivers: bool = True,
+                             profile: str = 'laps'):
+        return self._replay('get_practice_results', **practice_key(year, round_number, practice_num, drivers))
+
+    def get_qualifying_results(self,
+                               year: int,
+                               round_number: int,
+                               sprint: bool = False,
+                               profile: str = 'laps'):
+        return self._replay('get_qualifying_results', **qualifying_key(year, round_number, sprint))
+
+    def get_race_results(self,
+                         year: int,
+                         round_number: int,
+                         sprint: bool = False,
+                         laps: bool = False,
+                         profile: str = None):
+        return self._replay('get_race_results', **race_key(year, round_number, sprint, laps))
+
+    def get_session_weather(self,
+                            year: int,
+                            round_number: int,
+                            identifier: str,
+                            profile: str = 'laps+weather'):
+        return self._replay('get_session_weather', **session_key(year, round_number, identifier))
+
+    def get_session_laps(self,
+                         year: int,
+                         round_number: int,
+                         identifier: str,
+                         profile: str = 'laps'):
+        return self._replay('get_session_laps', **session_key(year, round_number, identifier))
+
+
+def event_key(year, round_number) -> dict:
+    return {'year': int(year), 'round_number': int(round_number)}
+
+
+def practice_key(year, round_number, practice_num, drivers) -> dict:
+    return {'year': int(year),
+            'round_number': int(round_number),
+            'practice_num': None if practice_num is None else int(practice_num),
+            'drivers': bool(drivers)}
+
+
+def qualifying_key(year, round_number, sprint) -> dict:
+    return {'year': int(year), 'round_number': int(round_number), 'sprint': bool(sprint)}
+
+
+def race_key(year, round_number, sprint, laps) -> dict:
+    return {'year': int(year), 'round_number': int(round_number), 'sprint': bool(sprint), 'laps': bool(laps)}
+
+
+def session_key(year, round_number, identifier) -> dict:
+    return {'year': int(year), 'round_number': int(round_number), 'identifier': str(identifier)}
+
+
+def telemetry_key(year, round_number, identifier, grid, step) -> dict:
+    return {**session_key(year, round_number, identifier), 'grid': str(grid), 'step': float(step)}
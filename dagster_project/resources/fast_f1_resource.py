@@ -1,104 +1,456 @@
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
-from dagster import ConfigurableResource
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from dagster import ConfigurableResource, InitResourceContext
+from pydantic import PrivateAttr
 import fastf1 as ff1
-from typing import Literal
+from typing import Literal, Optional, Sequence
 from fastf1.core import Session, Laps
 from fastf1.exceptions import DataNotLoadedError
+from resources.fast_f1_cache import FastF1CacheIndex
+from resources.fast_f1_cache_store import PackedCacheStore
+from resources.rate_limit import TokenBucket
+from resources.fast_f1_replay import (ReplayArchive, FastF1ReplayClient, practice_key, qualifying_key, race_key,
+                                      session_key, telemetry_key, event_key)
+from resources.season_schedule import SeasonScheduleIndex
+from resources.session_lake import SessionLake
+
+try:
+    from fastf1 import _api as ff1_api
+except ImportError:
+    from fastf1 import api as ff1_api
+
+# Sessions that started inside this window may still be receiving timing data, so they are never held in memory.
+LIVE_SESSION_WINDOW = timedelta(hours=12)
+
+LoadProfile = Literal['results', 'laps', 'laps+weather', 'full telemetry']
+
+# Components passed to Session.load for each profile, ordered from lightest to heaviest. Race control messages are
+# part of every lap profile because FastF1 uses them to flag deleted laps.
+LOAD_PROFILES = {
+    'results': dict(laps=False, telemetry=False, weather=False, messages=False),
+    'laps': dict(laps=True, telemetry=False, weather=False, messages=True),
+    'laps+weather': dict(laps=True, telemetry=False, weather=True, messages=True),
+    'full telemetry': dict(laps=True, telemetry=True, weather=True, messages=True),
+}
+
+# Approximate number of live timing api calls an uncached Session.load makes for each profile, charged against the
+# shared rate limit budget
+LOAD_PROFILE_CALLS = {
+    'results': 3,
+    'laps': 8,
+    'laps+weather': 9,
+    'full telemetry': 11,
+}
+PROBE_CALLS = 3
+
+# Laps columns used by the race lap cleaning assets, everything else is dropped at extraction
+RACE_LAP_COLUMNS = ['Driver', 'Team', 'LapNumber', 'LapTime', 'Stint', 'PitInTime', 'PitOutTime', 'Sector1Time',
+                    'Sector2Time', 'Sector3Time', 'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'Compound', 'TyreLife',
+                    'LapStartDate', 'TrackStatus', 'Position', 'Deleted', 'DeletedReason', 'IsAccurate']
+
+FASTEST_LAP_COLUMNS = ['Driver', 'Team', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']
+
+WEATHER_COLUMNS = ['Time', 'WeatherDate', 'AirTemp', 'TrackTemp', 'Humidity', 'Pressure', 'Rainfall', 'WindDirection',
+                   'WindSpeed']
+
+# Returned for the frames a session has no data for
+EMPTY_FRAME_COLUMNS = {'laps': RACE_LAP_COLUMNS,
+                       'fastest_laps': FASTEST_LAP_COLUMNS,
+                       'weather': WEATHER_COLUMNS}
+
+TELEMETRY_CAR_COLUMNS = ['Speed', 'RPM', 'nGear', 'Throttle', 'Brake', 'DRS']
+TELEMETRY_POS_COLUMNS = ['X', 'Y', 'Z']
+
+
+# FastF1's session abbreviations, resolved to the session names the schedule uses
+SESSION_ABBREVIATIONS = {'FP1': 'Practice 1',
+                         'FP2': 'Practice 2',
+                         'FP3': 'Practice 3',
+                         'Q': 'Qualifying',
+                         'SQ': 'Sprint Qualifying',
+                         'SS': 'Sprint Shootout',
+                         'S': 'Sprint',
+                         'R': 'Race'}
+
+
+def session_name(year: int, identifier: str) -> str:
+    # Lake partitions and session cache keys use the full session name, so 'FP1' and 'Practice 1' share them
+    name = str(identifier)
+    names = {x.casefold(): x for x in SESSION_ABBREVIATIONS.values()}
+    name = SESSION_ABBREVIATIONS.get(name.upper(), names.get(name.casefold(), name))
+    # Like FastF1, the 2021 and 2022 Sprint Qualifying is the Sprint
+    if name == 'Sprint Qualifying' and int(year) in [2021, 2022]:
+        return 'Sprint'
+    return name
+
+
+def session_identifier(year: int, session_cd: int) -> str:
+    if session_cd in [1, 2, 3]:
+        return f'FP{session_cd}'
+    elif session_cd == 4:
+        return 'Qualifying'
+    elif session_cd == 5:
+        return 'Sprint Shootout' if year == 2023 else 'Sprint Qualifying'
+    elif session_cd == 6:
+        return 'Sprint'
+    elif session_cd == 7:
+        return 'Race'
+    else:
+        raise ValueError(f'Unexpected SESSION_CD {session_cd}')
+
+
+@dataclass(frozen=True)
+class SessionProbe:
+    drivers: int
+    laps: bool
+    timing_complete: bool
+
+
+class SessionCache:
+
+    def __init__(self, max_sessions: int = 8, max_mb: int = 2048):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_mb * 1024 ** 2
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sessions = OrderedDict()
+        self._sizes = dict()
+        self._lock = threading.Lock()
+
+    def resize(self, max_sessions: int, max_mb: int):
+        with self._lock:
+            self.max_sessions = max_sessions
+            self.max_bytes = max_mb * 1024 ** 2
+            self._evict()
+
+    def get(self, keys: Sequence[tuple]) -> Optional[Session]:
+        with self._lock:
+            for key in keys:
+                if key in self._sessions:
+                    self._sessions.move_to_end(key)
+                    self.hits += 1
+                    return self._sessions[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, session: Session):
+        size = self._session_size(session)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            self._sessions[key] = session
+            self._sizes[key] = size
+            self._sessions.move_to_end(key)
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'sessions': len(self._sessions),
+                    'size_mb': round(sum(self._sizes.values()) / 1024 ** 2, 1),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0}
+
+    def _evict(self):
+        while self._sessions and (len(self._sessions) > self.max_sessions
+                                  or sum(self._sizes.values()) > self.max_bytes):
+            key, _ = self._sessions.popitem(last=False)
+            self._sizes.pop(key)
+            self.evictions += 1
+
+    @staticmethod
+    def _session_size(session: Session) -> int:
+        size = 0
+        for attr in ['results', 'laps', 'weather_data', 'race_control_messages', 'car_data', 'pos_data']:
+            try:
+                data = getattr(session, attr)
+            except (DataNotLoadedError, AttributeError):
+                continue
+            frames = data.values() if isinstance(data, dict) else [data]
+            for frame in frames:
+                if isinstance(frame, pd.DataFrame):
+                    size += int(frame.memory_usage(deep=True).sum())
+        return size
+
+
+_session_cache = SessionCache()
+# Sessions being loaded by a thread in this process, other threads asking for the same session wait on its future
+_in_flight = dict()
+_in_flight_lock = threading.Lock()
+_enabled_cache_loc = None
+_enable_cache_lock = threading.Lock()
+
+
+def get_session_cache(max_sessions: int = 8, max_mb: int = 2048) -> SessionCache:
+    if (_session_cache.max_sessions, _session_cache.max_bytes) != (max_sessions, max_mb * 1024 ** 2):
+        _session_cache.resize(max_sessions, max_mb)
+    return _session_cache
+
+
+def _enable_cache(cache_loc: str):
+    global _enabled_cache_loc
+    with _enable_cache_lock:
+        if _enabled_cache_loc != cache_loc:
+            ff1.Cache.enable_cache(cache_loc)
+            _enabled_cache_loc = cache_loc
+
 
 class FastF1Client:
 
-    def __init__(self, cache_loc: str):
+    def __init__(self,
+                 cache_loc: str,
+                 session_cache: Optional[SessionCache] = None,
+                 lake: Optional[SessionLake] = None,
+                 max_workers: int = 3,
+                 rate_limit: Optional[TokenBucket] = None,
+                 rate_limit_timeout: Optional[float] = None,
+                 session_lock_timeout: float = -1,
+                 packed_store: Optional[PackedCacheStore] = None):
         self.cache_loc = cache_loc
-        self.sess = None
-        ff1.Cache.enable_cache(self.cache_loc)
+        self.packed_store = packed_store
+        self.session_lock_timeout = session_lock_timeout
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.rate_limit_timeout = rate_limit_timeout
+        self.session_cache = session_cache if session_cache is not None else get_session_cache()
+        self.lake = lake
+        self.cache_index = FastF1CacheIndex(self.cache_loc)
+        self.schedule = SeasonScheduleIndex(self.cache_loc)
+        # Live sessions are kept out of the process wide cache, but one client serves one run, so a run reads the
+        # results and the weather of a live session from the same load
+        self._live_sessions = dict()
+        self._stats_lock = threading.Lock()
+        self._stats = {'api_loads': 0, 'disk_cache_loads': 0, 'lake_reads': 0, 'rehydrated_sessions': 0,
+                       'rate_limit_wait_s': 0.0}
+        _enable_cache(self.cache_loc)
+
+    def _load(self, session: Session, profile: LoadProfile):
+        # Only one process downloads a session into the cache at a time, the others wait and then load it from disk
+        with self.cache_index.session_lock(session.api_path).acquire(timeout=self.session_lock_timeout):
+            session_dir = self.cache_index.session_dir(session.api_path)
+            if self.packed_store is not None and self.packed_store.unpack(session_dir):
+                self._count('rehydrated_sessions')
+            # Probes, cache warm ups and lighter profiles also create the session folder, so a load is only a cache
+            # hit, and free of the rate limit budget, when this profile or a heavier one has been downloaded before
+            profiles = list(LOAD_PROFILES)
+            cached = not self.cache_index.loaded_profiles(session.api_path).isdisjoint(
+                profiles[profiles.index(profile):])
+            waited = 0.0
+            if not cached and self.rate_limit is not None:
+                waited = self.rate_limit.acquire(LOAD_PROFILE_CALLS[profile], timeout=self.rate_limit_timeout)
+            session.load(**LOAD_PROFILES[profile])
+            self.cache_index.record_profile(session.api_path, profile)
+            self.cache_index.record_access(session.api_path, cached)
+        self._count('disk_cache_loads' if cached else 'api_loads', rate_limit_wait_s=waited)
+
+    def _count(self, stat: str, rate_limit_wait_s: float = 0.0):
+        # Practice sessions are loaded from a thread pool, so the counters are shared between threads
+        with self._stats_lock:
+            self._stats[stat] += 1
+            self._stats['rate_limit_wait_s'] += rate_limit_wait_s
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats, rate_limit_wait_s=round(self._stats['rate_limit_wait_s'], 2))
 
     def _load_session(self,
                       year: int,
                       gp: int,
                       identifier: str,
-                      laps: bool = False):
+                      profile: LoadProfile = 'results') -> Session:
+
+        if profile not in LOAD_PROFILES:
+            raise ValueError(f'Unknown load profile {profile}, expected one of {list(LOAD_PROFILES)}')
 
-        self.sess = ff1.get_session(year=year,
-                                    gp=gp,
-                                    identifier=identifier)
-        self.sess.load(laps=laps)
+        # A session loaded with a heavier profile can serve any lighter one
+        identifier = session_name(year, identifier)
+        profiles = list(LOAD_PROFILES)
+        keys = [(int(year), int(gp), identifier, p) for p in profiles[profiles.index(profile):]]
+        session = self.session_cache.get(keys)
+        if session is None:
+            session = next((self._live_sessions[key] for key in keys if key in self._live_sessions), None)
+        if session is not None:
+            return session
+
+        flight_key = (self.cache_loc, *keys[0])
+        with _in_flight_lock:
+            flight = _in_flight.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = _in_flight[flight_key] = Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            session = ff1.get_session(year=int(year),
+                                      gp=int(gp),
+                                      identifier=identifier)
+            self._load(session, profile)
+            if self._is_historic(session):
+                self.session_cache.put(keys[0], session)
+            else:
+                self._live_sessions[keys[0]] = session
+            flight.set_result(session)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        finally:
+            with _in_flight_lock:
+                _in_flight.pop(flight_key, None)
+        return session
 
     @staticmethod
-    def _session_list(year: int, round_number: int):
+    def _is_historic(session: Session) -> bool:
+        return not pd.isnull(session.date) and session.date < datetime.utcnow() - LIVE_SESSION_WINDOW
+
+    def _session_frames(self,
+                        year: int,
+                        gp: int,
+                        identifier: str,
+                        frames: Sequence[Literal['results', 'laps', 'fastest_laps', 'weather']],
+                        profile: LoadProfile) -> dict:
+
+        identifier = session_name(year, identifier)
+        if self.lake is not None:
+            lake_frames = {frame: self.lake.read(year, gp, identifier, frame) for frame in frames}
+            if all(df is not None for df in lake_frames.values()):
+                self._count('lake_reads')
+                return lake_frames
+
+        session = self._load_session(year=year,
+                                     gp=gp,
+                                     identifier=identifier,
+                                     profile=profile)
+        extracted = self._extract_frames(session)
+        if self.lake is not None and self._is_historic(session):
+            self.lake.write(year, gp, identifier, extracted)
+        # A session without lap or weather data still answers with empty frames, they are never persisted to the
+        # lake so a lighter load can not hide the data of a heavier one
+        return {frame: extracted[frame] if frame in extracted else pd.DataFrame(columns=EMPTY_FRAME_COLUMNS[frame])
+                for frame in frames}
+
+    def _extract_frames(self, session: Session) -> dict:
+        frames = {'results': pd.DataFrame(session.results)}
+        try:
+            frames['laps'] = pd.DataFrame(self._driver_laps(session)[RACE_LAP_COLUMNS])
+            frames['fastest_laps'] = pd.DataFrame(self._fastest_laps(session)[FASTEST_LAP_COLUMNS])
+        except DataNotLoadedError:
+            pass
         try:
-            event = ff1.get_event(year, round_number)[
-                ['Session1', 'Session2', 'Session3', 'Session4', 'Session5']].to_frame()
-            return [x for c in event.columns for x in event[c]]
+            weather = pd.DataFrame(session.weather_data)
+            # Time is relative to the session start, t0_date is only known once the laps have been loaded
+            weather['WeatherDate'] = session.t0_date + weather['Time']
+            frames['weather'] = weather[WEATHER_COLUMNS]
+        except DataNotLoadedError:
+            pass
+        return frames
+
+    def get_session_list(self, year: int, round_number: int) -> list:
+        return list(self._session_list(year, round_number))
+
+    def _session_list(self, year: int, round_number: int):
+        try:
+            return self.schedule.session_list(year, round_number)
         except ValueError as err:
             if 'Failed to load any schedule data.' in err.args[0]:
                 return ['Practice 1', 'Practice 2', 'Practice 3', 'Qualifying', 'Race']
             else:
                 raise ValueError(err)
 
-    def _fastest_laps(self):
-        fastest_laps = list()
-        for driver in self.sess.drivers:
-            try:
-                lap = self.sess.laps.pick_drivers(driver).pick_fastest()
-                lap['Driver']
-                fastest_laps.append(lap)
-            except TypeError:
-                pass
-            except DataNotLoadedError:
-                return pd.DataFrame(columns=['Driver', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time'])
+    @staticmethod
+    def _fastest_laps(session: Session):
+        try:
+            laps = session.laps
+        except DataNotLoadedError:
+            return pd.DataFrame(columns=FASTEST_LAP_COLUMNS)
 
-        return Laps(fastest_laps).sort_values(by='LapTime').reset_index(drop=True)
+        # Same selection as Laps.pick_fastest, done for every driver in one pass over the laps
+        candidates = laps.loc[laps['DriverNumber'].isin(session.drivers)
+                              & (laps['IsPersonalBest'] == True)
+                              & laps['LapTime'].notna()]
+        fastest = laps.loc[candidates.groupby('DriverNumber', sort=False)['LapTime'].idxmin()]
+
+        return Laps(fastest).sort_values(by='LapTime').reset_index(drop=True)
 
     def _practice_results(self,
                           year: int,
                           round_number: int,
                           practice_num: Literal[1, 2, 3],
-                          drivers: bool):
+                          drivers: bool,
+                          profile: LoadProfile):
 
         identifier = 'FP{}'.format(practice_num)
 
-        self._load_session(year=year,
-                           gp=round_number,
-                           identifier=identifier,
-                           laps=True)
+        frames = self._session_frames(year=year,
+                                      gp=round_number,
+                                      identifier=identifier,
+                                      frames=['results', 'fastest_laps'],
+                                      profile=profile)
 
         if drivers:
-            driver_df = self.sess.results[['DriverId', 'TeamId', 'Abbreviation']]
-            df = self._fastest_laps()[['Driver', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']]
+            driver_df = frames['results'][['DriverId', 'TeamId', 'Abbreviation']]
+            df = frames['fastest_laps'][['Driver', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']]
             df = driver_df.set_index('Abbreviation').join(df.set_index('Driver'))
         else:
-            df = self._fastest_laps()[['Driver', 'Team', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']]
+            df = frames['fastest_laps'][['Driver', 'Team', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']]
         return df
 
-    def _get_race_laps(self):
-        laps = pd.DataFrame()
-        for driver in self.sess.drivers:
-            laps = pd.concat([laps, self.sess.laps.pick_drivers(driver)])
-        return laps
+    @staticmethod
+    def _driver_laps(session: Session) -> pd.DataFrame:
+        laps = session.laps
+        return laps.loc[laps['DriverNumber'].isin(session.drivers)]
+
+    @staticmethod
+    def _iter_driver_laps(laps: pd.DataFrame):
+        for _, driver_laps in laps.groupby('Driver', sort=False):
+            yield driver_laps
+
+    @staticmethod
+    def _race_identifier(year: int, sprint: bool) -> str:
+        if sprint and year >= 2021:
+            return 'Sprint'
+        elif not sprint:
+            return 'Race'
+        else:
+            raise Exception('Sprint Race is not supported before 2021')
 
     def get_practice_results(self,
                              year: int,
                              round_number: int,
                              practice_num: Literal[1, 2, 3, None] = None,
-                             drivers: bool = True):
+                             drivers: bool = True,
+                             profile: LoadProfile = 'laps'):
 
         if practice_num is None:
             sessions = [x[-1] for x in self._session_list(year, round_number) if 'Practice' in x]
-            df = pd.DataFrame()
-            for session in sessions:
-                api_data = self._practice_results(year, round_number, session, drivers).copy()
-                api_data.loc[:, 'SESSION_CD'] = session
-                df = pd.concat([df, api_data])
-            return df
+            if len(sessions) == 0:
+                return pd.DataFrame()
+
+            # Each practice session is loaded into its own Session object, so they can be fetched side by side
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sessions))) as executor:
+                results = executor.map(lambda x: self._practice_results(year, round_number, x, drivers, profile),
+                                       sessions)
+                api_data = [df.assign(SESSION_CD=session) for session, df in zip(sessions, results)]
+            return pd.concat(api_data)
         else:
-            api_data = self._practice_results(year, round_number, practice_num, drivers).copy()
-            api_data.loc[:, 'SESSION_CD'] = practice_num
-            return api_data
+            api_data = self._practice_results(year, round_number, practice_num, drivers, profile)
+            return api_data.assign(SESSION_CD=practice_num)
 
     def get_qualifying_results(self,
                                year: int,
                                round_number: int,
-                               sprint: bool = False):
+                               sprint: bool = False,
+                               profile: LoadProfile = 'laps'):
 
         if sprint and year == 2023:
             identifier = 'Sprint Shootout'
@@ -109,12 +461,11 @@ class FastF1Client:
         else:
             raise Exception('Sprint Qualifying is not supported before 2023')
 
-        self._load_session(year=year,
-                           gp=round_number,
-                           identifier=identifier,
-                           laps=True)
-
-        df = self.sess.results
+        df = self._session_frames(year=year,
+                                  gp=round_number,
+                                  identifier=identifier,
+                                  frames=['results'],
+                                  profile=profile)['results']
 
         return df[['Abbreviation', 'TeamName', 'Position', 'Q1', 'Q2', 'Q3']]
 
@@ -122,54 +473,402 @@ class FastF1Client:
                          year: int,
                          round_number: int,
                          sprint: bool = False,
-                         laps: bool = False):
+                         laps: bool = False,
+                         profile: Optional[LoadProfile] = None):
 
-        if sprint and year >= 2021:
-            identifier = 'Sprint'
-        elif not sprint:
-            identifier = 'Race'
-        else:
-            raise Exception('Sprint Race is not supported before 2021')
+        identifier = self._race_identifier(year, sprint)
+
+        if profile is None:
+            profile = 'laps' if laps else 'results'
 
         if laps:
-            self._load_session(year=year,
-                               gp=round_number,
-                               identifier=identifier,
-                               laps=laps)
-            return self._get_race_laps()
+            return self._session_frames(year=year,
+                                        gp=round_number,
+                                        identifier=identifier,
+                                        frames=['laps'],
+                                        profile=profile)['laps']
         else:
-            self._load_session(year=year,
-                               gp=round_number,
-                               identifier=identifier)
-            df = self.sess.results
+            df = self._session_frames(year=year,
+                                      gp=round_number,
+                                      identifier=identifier,
+                                      frames=['results'],
+                                      profile=profile)['results']
             return df[['DriverId', 'TeamId', 'ClassifiedPosition', 'Position', 'Time', 'Status', 'Points']]
 
+    def get_session_weather(self,
+                            year: int,
+                            round_number: int,
+                            identifier: str,
+                            profile: LoadProfile = 'laps+weather'):
+
+        if profile not in ['laps+weather', 'full telemetry']:
+            raise ValueError(f'Session weather needs the laps+weather or full telemetry profile, got {profile}')
+
+        return self._session_frames(year=year,
+                                    gp=round_number,
+                                    identifier=identifier,
+                                    frames=['weather'],
+                                    profile=profile)['weather']
+
+    @staticmethod
+    def probe_session(year: int,
+                      round_number: int,
+                      identifier: str) -> SessionProbe:
+
+        # Only the driver list, stint and session status feeds are fetched, no Session.load
+        session = ff1.get_session(year=int(year),
+                                  gp=int(round_number),
+                                  identifier=identifier)
+        try:
+            drivers = ff1_api.driver_info(session.api_path)
+            laps = ff1_api.timing_app_data(session.api_path)
+            status = ff1_api.session_status_data(session.api_path)
+        except ff1_api.SessionNotAvailableError:
+            return SessionProbe(drivers=0, laps=False, timing_complete=False)
+
+        return SessionProbe(drivers=len(drivers),
+                            laps=not laps.empty,
+                            timing_complete=any(x in ['Finalised', 'Ends'] for x in status['Status']))
+
+    def warm_cache(self,
+                   year: int,
+                   round_number: int,
+                   session: str) -> list:
+
+        warmed = list()
+        self.schedule.season(year)
+        warmed.append(f'{year} schedule')
+
+        # FastF1 resolves codes like FP1 or Q to the session names used by the schedule
+        upcoming = ff1.get_session(year=int(year), gp=int(round_number), identifier=session)
+        sessions = self._session_list(year, round_number)
+        if upcoming.name not in sessions:
+            raise ValueError(f'{session} ({upcoming.name}) is not a session of round {round_number} in {year}, '
+                             f'expected one of {sessions}')
+        prior_sessions = sessions[:sessions.index(upcoming.name)]
+        for prior_session in prior_sessions:
+            try:
+                self._session_frames(year=year,
+                                     gp=round_number,
+                                     identifier=prior_session,
+                                     frames=['results', 'laps'],
+                                     profile='laps')
+                warmed.append(prior_session)
+            except (DataNotLoadedError, ff1_api.SessionNotAvailableError):
+                pass
+
+        # Driver info is published ahead of the session, the timing data itself only exists once it has started
+        try:
+            ff1_api.driver_info(upcoming.api_path)
+            warmed.append(f'{session} driver info')
+        except ff1_api.SessionNotAvailableError:
+            pass
+
+        return warmed
+
+    @staticmethod
+    def _downsample_lap(lap, grid: Literal['distance', 'time'], step: float) -> Optional[pd.DataFrame]:
+        car = lap.get_car_data().add_distance()
+        pos = lap.get_pos_data()
+        if len(car) < 2 or len(pos) < 2:
+            return None
+
+        car_time = car['SessionTime'].dt.total_seconds().to_numpy()
+        pos_time = pos['SessionTime'].dt.total_seconds().to_numpy()
+        axis = car['Distance'].to_numpy() if grid == 'distance' else car_time - car_time[0]
+        target = np.arange(0, axis[-1], step)
+
+        data = {'GRID_VALUE': target}
+        for col in TELEMETRY_CAR_COLUMNS:
+            data[col] = np.interp(target, axis, car[col].to_numpy(dtype=float))
+        # Position is sampled on its own clock, so align it to the car data before moving it onto the grid
+        for col in TELEMETRY_POS_COLUMNS:
+            data[col] = np.interp(target, axis, np.interp(car_time, pos_time, pos[col].to_numpy(dtype=float)))
+
+        df = pd.DataFrame(data).astype('float32')
+        df.insert(0, 'Driver', lap['Driver'])
+        df.insert(1, 'LapNumber', int(lap['LapNumber']))
+        return df
+
+    def iter_lap_telemetry(self,
+                           year: int,
+                           round_number: int,
+                           identifier: str,
+                           grid: Literal['distance', 'time'] = 'distance',
+                           step: float = 10.0):
+
+        # The live timing feed carries every car in one stream, so FastF1 decodes the whole session's telemetry up
+        # front and peak memory is that raw telemetry plus one downsampled lap. Telemetry sessions bypass the session
+        # cache so each driver's raw data can be released once their laps are processed
+        session = ff1.get_session(year=int(year),
+                                  gp=int(round_number),
+                                  identifier=identifier)
+        self._load(session, 'full telemetry')
+        laps = session.laps
+        laps = laps.loc[laps['DriverNumber'].isin(session.drivers) & laps['LapTime'].notna()]
+
+        for driver, driver_laps in laps.groupby('DriverNumber', sort=False):
+            for _, lap in Laps(driver_laps, session=session).iterlaps():
+                chunk = self._downsample_lap(lap, grid, step)
+                if chunk is not None:
+                    yield chunk
+            session.car_data.pop(driver, None)
+            session.pos_data.pop(driver, None)
+
+    def get_session_laps(self,
+                         year: int,
+                         round_number: int,
+                         identifier: str,
+                         profile: LoadProfile = 'laps'):
+
+        return self._session_frames(year=year,
+                                    gp=round_number,
+                                    identifier=identifier,
+                                    frames=['laps'],
+                                    profile=profile)['laps']
+
+    def iter_session_laps(self,
+                          year: int,
+                          round_number: int,
+                          identifier: str,
+                          profile: LoadProfile = 'laps'):
+        yield from self._iter_driver_laps(self.get_session_laps(year, round_number, identifier, profile))
+
+    def iter_race_laps(self,
+                       year: int,
+                       round_number: int,
+                       sprint: bool = False,
+                       profile: LoadProfile = 'laps'):
+        yield from self.iter_session_laps(year, round_number, self._race_identifier(year, sprint), profile)
+
 
 class FastF1Resource(ConfigurableResource):
     cache_loc: str
+    session_cache_size: int = 8
+    session_cache_mb: int = 2048
+    use_session_lake: bool = True
+    lake_loc: Optional[str] = None
+    practice_workers: int = 3
+    backfill_workers: int = 4
+    # Seconds between the first backfill workers starting
+    backfill_submit_interval: float = 1.0
+    # live calls the FastF1 API, record also saves every result to replay_loc and replay serves results from it
+    mode: str = 'live'
+    replay_loc: Optional[str] = None
+    # Replay sleeps for the latency recorded with each call times replay_latency_scale, replay_latency_ms overrides
+    # it with a fixed latency
+    replay_latency_ms: Optional[float] = None
+    replay_latency_scale: float = 1.0
+    replay_jitter_ms: float = 0.0
+    replay_seed: int = 0
+    # Budget shared by every process on the host that loads from the FastF1 api
+    rate_limit_db: Optional[str] = None
+    api_calls_per_hour: int = 450
+    api_burst: int = 30
+    rate_limit_timeout: float = 3600
+    # Sensor probes draw from their own bucket so ticks cannot starve the loads, a probe with no tokens left fails
+    # straight away with RateLimitTimeout rather than holding up the sensor
+    probe_calls_per_hour: int = 180
+    probe_burst: int = 15
+    # Seconds to wait for another run downloading the same session, -1 waits until it is done
+    session_lock_timeout: float = -1
+
+    # One client per run, created in setup_for_execution or on first use when the resource is built directly
+    _client = PrivateAttr(default=None)
+    _calls = PrivateAttr(default_factory=dict)
+
+    def setup_for_execution(self, context: InitResourceContext) -> None:
+        self._client = self._build_client()
+        self._calls = dict()
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        if self._calls:
+            context.log.info(f'FastF1 resource run stats: {self.run_stats()}')
+        self._client = None
+
+    def run_stats(self) -> dict:
+        stats = {'mode': self.mode,
+                 'calls': {method: {'count': count, 'seconds': round(seconds, 2)}
+                           for method, (count, seconds) in self._calls.items()},
+                 'session_cache': self.session_cache_stats()}
+        if isinstance(self._client, FastF1Client):
+            stats.update(self._client.stats())
+        return stats
+
+    @property
+    def session_lake_loc(self) -> str:
+        if self.lake_loc:
+            return self.lake_loc
+        # Defaults to a folder alongside the FastF1 cache
+        return os.path.join(os.path.dirname(os.path.normpath(self.cache_loc)), 'fastf1_session_lake')
+
+    def _replay_archive(self) -> ReplayArchive:
+        if not self.replay_loc:
+            raise Exception(f'replay_loc must be set when the FastF1 resource mode is {self.mode}')
+        return ReplayArchive(self.replay_loc)
+
+    def _recorded(self, df: pd.DataFrame, method: str, key: dict, seconds: float) -> pd.DataFrame:
+        if self.mode == 'record':
+            self._replay_archive().record(df, method, latency_ms=seconds * 1000, **key)
+        return df
+
+    def _rate_limit(self) -> TokenBucket:
+        return TokenBucket(name='fastf1',
+                           calls_per_hour=self.api_calls_per_hour,
+                           burst=self.api_burst,
+                           db_path=self.rate_limit_db)
+
+    def _probe_rate_limit(self) -> TokenBucket:
+        return TokenBucket(name='fastf1_probe',
+                           calls_per_hour=self.probe_calls_per_hour,
+                           burst=self.probe_burst,
+                           db_path=self.rate_limit_db)
+
+    def _call(self, method: str, key: dict, fetch) -> pd.DataFrame:
+        start = time.perf_counter()
+        df = fetch(self.get_client())
+        seconds = time.perf_counter() - start
+        self._count_call(method, seconds)
+        return self._recorded(df, method, key, seconds)
+
+    def _count_call(self, method: str, seconds: float):
+        count, total = self._calls.get(method, (0, 0.0))
+        self._calls[method] = (count + 1, total + seconds)
+
+    def get_client(self):
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    def _build_client(self):
+        if self.mode not in ['live', 'record', 'replay']:
+            raise Exception(f'Unknown FastF1 resource mode {self.mode}, expected live, record or replay')
+        if self.mode == 'replay':
+            return FastF1ReplayClient(archive=self._replay_archive(),
+                                      latency_ms=self.replay_latency_ms,
+                                      latency_scale=self.replay_latency_scale,
+                                      jitter_ms=self.replay_jitter_ms,
+                                      seed=self.replay_seed)
+        return FastF1Client(cache_loc=self.cache_loc,
+                            session_cache=get_session_cache(self.session_cache_size, self.session_cache_mb),
+                            lake=SessionLake(self.session_lake_loc) if self.use_session_lake else None,
+                            max_workers=self.practice_workers,
+                            rate_limit=self._rate_limit(),
+                            rate_limit_timeout=self.rate_limit_timeout,
+                            session_lock_timeout=self.session_lock_timeout,
+                            # Sessions packed by the fastf1_cache_pack asset are always rehydrated before a load,
+                            # zstandard is only needed once something has been packed
+                            packed_store=PackedCacheStore(self.cache_loc))
+
+    def probe_session(self,
+                      year: int,
+                      round_number: int,
+                      identifier: str) -> SessionProbe:
+        start = time.perf_counter()
+        client = self.get_client()
+        if self.mode == 'replay':
+            probe = SessionProbe(**client.probe_session(year, round_number, identifier))
+        else:
+            self._probe_rate_limit().acquire(PROBE_CALLS, timeout=0)
+            probe = client.probe_session(year, round_number, identifier)
+        seconds = time.perf_counter() - start
+        self._count_call('probe_session', seconds)
+        self._recorded(pd.DataFrame([asdict(probe)]), 'probe_session', session_key(year, round_number, identifier),
+                       seconds)
+        return probe
+
+    def warm_cache(self,
+                   year: int,
+                   round_number: int,
+                   session: str) -> list:
+        # Replay serves the recorded list, there is no cache to warm
+        return list(self._call('warm_cache',
+                               session_key(year, round_number, session),
+                               lambda client: pd.DataFrame({'warmed': client.warm_cache(year, round_number,
+                                                                                        session)}))['warmed'])
+
+    def get_session_list(self,
+                         year: int,
+                         round_number: int) -> list:
+        sessions = self._call('get_session_list',
+                              event_key(year, round_number),
+                              lambda client: pd.DataFrame({'sessions': client.get_session_list(year, round_number)}))
+        return list(sessions['sessions'])
 
-    def get_client(self) -> FastF1Client:
-        return FastF1Client(cache_loc=self.cache_loc)
+    def session_cache_stats(self) -> dict:
+        return get_session_cache(self.session_cache_size, self.session_cache_mb).stats()
 
     def get_practice_results(self,
                              year: int,
                              round_number: int,
                              practice_num: Literal[1, 2, 3, None] = None,
-                             drivers: bool = True) -> pd.DataFrame:
-        client = self.get_client()
-        return client.get_practice_results(year, round_number, practice_num, drivers)
+                             drivers: bool = True,
+                             profile: LoadProfile = 'laps') -> pd.DataFrame:
+        return self._call('get_practice_results',
+                          practice_key(year, round_number, practice_num, drivers),
+                          lambda client: client.get_practice_results(year, round_number, practice_num, drivers,
+                                                                     profile))
 
     def get_qualifying_results(self,
                                year: int,
                                round_number: int,
-                               sprint: bool = False) -> pd.DataFrame:
-        client = self.get_client()
-        return client.get_qualifying_results(year, round_number, sprint)
+                               sprint: bool = False,
+                               profile: LoadProfile = 'laps') -> pd.DataFrame:
+        return self._call('get_qualifying_results',
+                          qualifying_key(year, round_number, sprint),
+                          lambda client: client.get_qualifying_results(year, round_number, sprint, profile))
 
     def get_race_results(self,
                          year: int,
                          round_number: int,
                          sprint: bool = False,
-                         laps: bool = False) -> pd.DataFrame:
-        client = self.get_client()
-        return client.get_race_results(year, round_number, sprint, laps)
+                         laps: bool = False,
+                         profile: Optional[LoadProfile] = None) -> pd.DataFrame:
+        return self._call('get_race_results',
+                          race_key(year, round_number, sprint, laps),
+                          lambda client: client.get_race_results(year, round_number, sprint, laps, profile))
+
+    def get_session_weather(self,
+                            year: int,
+                            round_number: int,
+                            identifier: str,
+                            profile: LoadProfile = 'laps+weather') -> pd.DataFrame:
+        return self._call('get_session_weather',
+                          session_key(year, round_number, identifier),
+                          lambda client: client.get_session_weather(year, round_number, identifier, profile))
+
+    def get_session_laps(self,
+                         year: int,
+                         round_number: int,
+                         identifier: str,
+                         profile: LoadProfile = 'laps') -> pd.DataFrame:
+        return self._call('get_session_laps',
+                          session_key(year, round_number, identifier),
+                          lambda client: client.get_session_laps(year, round_number, identifier, profile))
+
+    def iter_session_laps(self,
+                          year: int,
+                          round_number: int,
+                          identifier: str,
+                          profile: LoadProfile = 'laps'):
+        # Goes through get_session_laps so the laps are recorded and replayed like the other results
+        yield from FastF1Client._iter_driver_laps(self.get_session_laps(year, round_number, identifier, profile))
+
+    def iter_race_laps(self,
+                       year: int,
+                       round_number: int,
+                       sprint: bool = False,
+                       profile: LoadProfile = 'laps'):
+        yield from self.iter_session_laps(year, round_number, FastF1Client._race_identifier(year, sprint), profile)
+
+    def iter_lap_telemetry(self,
+                           year: int,
+                           round_number: int,
+                           identifier: str,
+                           grid: Literal['distance', 'time'] = 'distance',
+                           step: float = 10.0):
+        chunks = self.get_client().iter_lap_telemetry(year, round_number, identifier, grid, step)
+        if self.mode == 'record':
+            chunks = self._replay_archive().record_parts(chunks, 'iter_lap_telemetry',
+                                                         **telemetry_key(year, round_number, identifier, grid, step))
+        yield from chunks
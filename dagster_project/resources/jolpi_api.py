@@ -1,16 +1,31 @@
 from dagster import ConfigurableResource
+from typing import Optional
 import requests
 import pandas as pd
+from resources.rate_limit import TokenBucket
 
 
 class JolpiResource(ConfigurableResource):
+    # Jolpica allows 4 requests a second and 500 an hour, the budget is shared by every process on the host
+    rate_limit_db: Optional[str] = None
+    calls_per_hour: int = 450
+    burst: int = 4
+    rate_limit_timeout: float = 3600
+
     @property
     def query_url(self) -> str:
         return 'https://api.jolpi.ca/ergast/f1/'
 
+    def _get(self, query: str) -> requests.Response:
+        TokenBucket(name='jolpi',
+                    calls_per_hour=self.calls_per_hour,
+                    burst=self.burst,
+                    db_path=self.rate_limit_db).acquire(timeout=self.rate_limit_timeout)
+        return requests.get(query)
+
     def get_tracks(self, year: int):
         query = self.query_url + f'{year}/circuits/'
-        response = requests.get(query)
+        response = self._get(query)
         if response.status_code == 200:
             circuit_data = response.json()['MRData']['CircuitTable']['Circuits']
             df = pd.DataFrame(circuit_data)
@@ -33,7 +48,7 @@ class JolpiResource(ConfigurableResource):
 
     def get_track_event(self, year: int):
         query = self.query_url + f'{year}/races/'
-        response = requests.get(query)
+        response = self._get(query)
         if response.status_code == 200:
             circuit_event_data = response.json()['MRData']['RaceTable']['Races']
             df = pd.DataFrame(circuit_event_data)
@@ -49,7 +64,7 @@ class JolpiResource(ConfigurableResource):
 
     def get_drivers(self, year: int):
         query = self.query_url + f'{year}/drivers/'
-        response = requests.get(query)
+        response = self._get(query)
         if response.status_code == 200:
             driver_data = response.json()['MRData']['DriverTable']['Drivers']
             df = pd.DataFrame(driver_data)
@@ -60,7 +75,7 @@ class JolpiResource(ConfigurableResource):
 
     def get_constructors(self, year: int):
         query = self.query_url + f'{year}/constructors/'
-        response = requests.get(query)
+        response = self._get(query)
         if response.status_code == 200:
             driver_data = response.json()['MRData']['ConstructorTable']['Constructors']
             df = pd.DataFrame(driver_data)
@@ -0,0 +1,104 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from dagster import ConfigurableResource
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, URL
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+POOL_TIMEOUT = 30
+# MySQL drops idle connections after wait_timeout (8 hours by default), recycle well before that
+POOL_RECYCLE = 3600
+
+_engines = dict()
+_engines_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # A forked worker must not reuse the parent's sockets, it gets its own pools on first use. The lock is replaced
+    # too, another thread of the parent may have held it at fork time and it would never be released in the child
+    global _engines_lock
+    _engines_lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    _engines.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_engine(user: str,
+               password: str,
+               server: str,
+               port,
+               database: Optional[str] = None,
+               pool_size: int = POOL_SIZE,
+               max_overflow: int = MAX_OVERFLOW,
+               local_infile: bool = False) -> Engine:
+    url = URL.create('mysql+mysqlconnector',
+                     username=user,
+                     password=password,
+                     host=server,
+                     port=int(port) if port else None,
+                     database=database or None)
+    key = (url.render_as_string(hide_password=False), pool_size, max_overflow, local_infile)
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = create_engine(url,
+                                   pool_size=pool_size,
+                                   max_overflow=max_overflow,
+                                   pool_timeout=POOL_TIMEOUT,
+                                   pool_recycle=POOL_RECYCLE,
+                                   pool_pre_ping=True,
+                                   # LOAD DATA LOCAL INFILE is refused by the client unless it is allowed here
+                                   connect_args={'allow_local_infile': True} if local_infile else {})
+            _engines[key] = engine
+    return engine
+
+
+def pool_metrics() -> list:
+    with _engines_lock:
+        engines = list(_engines.values())
+    return [{'url': engine.url.render_as_string(hide_password=True),
+             'size': engine.pool.size(),
+             'checked_in': engine.pool.checkedin(),
+             'checked_out': engine.pool.checkedout(),
+             'overflow': engine.pool.overflow()}
+            for engine in engines]
+
+
+class MySQLPoolResource(ConfigurableResource):
+    user: str
+    password: str
+    host: str
+    port: str
+    database: Optional[str] = None
+    pool_size: int = POOL_SIZE
+    max_overflow: int = MAX_OVERFLOW
+
+    @property
+    def engine(self) -> Engine:
+        return get_engine(user=self.user,
+                          password=self.password,
+                          server=self.host,
+                          port=self.port,
+                          database=self.database,
+                          pool_size=self.pool_size,
+                          max_overflow=self.max_overflow)
+
+    @contextmanager
+    def get_connection(self):
+        # Same contract as dagster_mysql's MySQLResource, a DBAPI connection, but checked out of the shared pool
+        conn = self.engine.raw_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def pool_metrics(self) -> list:
+        return pool_metrics()
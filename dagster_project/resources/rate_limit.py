@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Optional
+
+# Every run on the host shares this database unless RATE_LIMIT_DB points somewhere else
+DEFAULT_RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'f1_rate_limit.sqlite'))
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+class TokenBucket:
+
+    def __init__(self,
+                 name: str,
+                 calls_per_hour: float,
+                 burst: int,
+                 db_path: Optional[str] = None):
+        self.name = name
+        self.rate = calls_per_hour / 3600
+        self.burst = burst
+        self.db_path = db_path or DEFAULT_RATE_LIMIT_DB
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # isolation_level None so the BEGIN IMMEDIATE below is the only transaction, it locks the database for
+        # writers in every process until the bucket has been updated
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+        return conn
+
+    def _take(self, conn: sqlite3.Connection, cost: float) -> float:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE name = ?', (self.name,)).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate)
+
+            # A cost larger than the burst is let through once the bucket is full, it then runs into debt
+            needed = min(cost, self.burst)
+            if tokens >= needed:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (needed - tokens) / self.rate
+
+            conn.execute('INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)',
+                         (self.name, tokens, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return wait
+
+    def acquire(self, cost: float = 1, timeout: Optional[float] = None) -> float:
+        start = time.monotonic()
+        conn = self._connect()
+        try:
+            while True:
+                wait = self._take(conn, cost)
+                if wait == 0:
+                    return time.monotonic() - start
+                if timeout is not None and time.monotonic() - start + wait > timeout:
+                    raise RateLimitTimeout(f'Waited {time.monotonic() - start:.0f}s for {cost} {self.name} tokens, '
+                                           f'next ones are due in {wait:.0f}s')
+                time.sleep(wait)
+        finally:
+            conn.close()
+
+    def available(self) -> float:
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE name = ?', (self.name,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return float(self.burst)
+        return min(self.burst, row[0] + (time.time() - row[1]) * self.rate)
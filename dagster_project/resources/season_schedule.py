@@ -0,0 +1,73 @@
+import os
+import pickle
+import threading
+import fastf1 as ff1
+from datetime import datetime, timedelta
+
+# The running season's calendar can still change, so its persisted index is rebuilt once it is this old
+CURRENT_SEASON_TTL = timedelta(days=1)
+
+_seasons = dict()
+_seasons_lock = threading.Lock()
+
+
+class SeasonScheduleIndex:
+
+    def __init__(self, cache_loc: str):
+        self.index_loc = os.path.join(cache_loc, 'season_schedule')
+
+    def _path(self, year: int) -> str:
+        return os.path.join(self.index_loc, f'{year}.pkl')
+
+    @staticmethod
+    def _is_stale(year: int, built_ts: datetime) -> bool:
+        return year >= datetime.utcnow().year and built_ts < datetime.utcnow() - CURRENT_SEASON_TTL
+
+    @staticmethod
+    def _build(year: int) -> dict:
+        schedule = ff1.get_event_schedule(year, include_testing=False)
+        index = dict()
+        for _, event in schedule.iterrows():
+            sessions = [event[f'Session{n}'] for n in range(1, 6)]
+            index[int(event['RoundNumber'])] = {
+                'sessions': sessions,
+                'times': {session: event[f'Session{n}DateUtc'] for n, session in enumerate(sessions, start=1)},
+                'format': event['EventFormat']
+            }
+        return index
+
+    def _read(self, year: int):
+        path = self._path(year)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def _write(self, year: int, season: dict):
+        os.makedirs(self.index_loc, exist_ok=True)
+        tmp_path = self._path(year) + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(season, file)
+        os.replace(tmp_path, self._path(year))
+
+    def season(self, year: int) -> dict:
+        year = int(year)
+        key = (self.index_loc, year)
+        with _seasons_lock:
+            season = _seasons.get(key)
+            if season is None or self._is_stale(year, season['built_ts']):
+                season = self._read(year)
+                if season is None or self._is_stale(year, season['built_ts']):
+                    season = {'built_ts': datetime.utcnow(), 'events': self._build(year)}
+                    self._write(year, season)
+                _seasons[key] = season
+        return season['events']
+
+    def session_list(self, year: int, round_number: int) -> list:
+        return self.season(year)[int(round_number)]['sessions']
+
+    def session_time_utc(self, year: int, round_number: int, session: str):
+        return self.season(year)[int(round_number)]['times'][session]
+
+    def event_format(self, year: int, round_number: int) -> str:
+        return self.season(year)[int(round_number)]['format']
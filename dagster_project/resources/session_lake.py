@@ -0,0 +1,38 @@
+import os
+import tempfile
+import pandas as pd
+from typing import Optional
+
+
+class SessionLake:
+
+    def __init__(self, lake_loc: str):
+        self.lake_loc = lake_loc
+
+    def _path(self, year: int, gp: int, identifier: str, frame: str) -> str:
+        return os.path.join(self.lake_loc,
+                            f'year={int(year)}',
+                            f'round={int(gp)}',
+                            f'session={identifier}',
+                            f'{frame}.parquet')
+
+    def read(self, year: int, gp: int, identifier: str, frame: str) -> Optional[pd.DataFrame]:
+        path = self._path(year, gp, identifier, frame)
+        if not os.path.isfile(path):
+            return None
+        return pd.read_parquet(path, memory_map=True)
+
+    def write(self, year: int, gp: int, identifier: str, frames: dict):
+        for frame, df in frames.items():
+            path = self._path(year, gp, identifier, frame)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so a reader never sees a half written file, each writer has its own temporary file
+            # so concurrent backfill workers can not clobber each other's
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+            os.close(fd)
+            try:
+                df.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
@@ -1,32 +1,58 @@
-import mysql.connector
+import os
+import time
+import tempfile
+from datetime import timedelta
 import pandas as pd
 from pandas import (
     DataFrame as PandasDataFrame,
     read_sql,
 )
-from sqlalchemy import create_engine, text
-from dagster import ConfigurableIOManager, OutputContext, InputContext, ConfigurableResource
+from sqlalchemy import text
+from dagster import ConfigurableIOManager, OutputContext, InputContext, ConfigurableResource, MetadataValue
 from contextlib import contextmanager
 import pyodbc
-from typing import Optional, Sequence
-import mysql.connector
+from typing import Iterable, Iterator, Optional, Sequence
+from resources.mysql_pool import get_engine, pool_metrics
+
+
+# insert is pandas' executemany, multi sends multi row INSERTs and bulk streams a TSV through LOAD DATA LOCAL INFILE
+WRITE_STRATEGIES = ['insert', 'multi', 'bulk']
+INSERT_CHUNKSIZE = 10000
+MULTI_CHUNKSIZE = 1000
+BULK_CHUNKSIZE = 100000
+# MySQL errors for LOAD DATA LOCAL INFILE being turned off, on the server (1148, 3948) or in the client (2068)
+LOCAL_INFILE_DISABLED_ERRNOS = {1148, 2068, 3948}
+MERGE_BATCHSIZE = 50000
+# Bookkeeping columns a merge only refreshes when one of the other columns of the row changed
+MERGE_TOUCH_COLUMNS = ['LOAD_TS']
+# Swap mode loads into the __new shadow table and keeps the replaced table as __old
+SHADOW_SUFFIX = '__new'
+OLD_SUFFIX = '__old'
+FILTER_OPERATORS = ['=', '!=', '<', '<=', '>', '>=', 'in', 'not in']
 
 
 @contextmanager
-def connect_sql(config):
-    user = config['user']
-    password = config['password']
-    database = config['database']
-    port = config['port']
-    server = config['server']
-
-    connection_string = f'mysql+mysqlconnector://{user}:{password}@{server}:{port}/{database}'
+def connect_sql(config, local_infile: bool = False):
+    # Connections come from the process wide pool for this config, closing one returns it to the pool
+    engine = get_engine(user=config['user'],
+                        password=config['password'],
+                        server=config['server'],
+                        port=config['port'],
+                        database=config['database'],
+                        local_infile=local_infile)
+    conn = engine.connect()
     try:
-        conn = create_engine(connection_string).connect()
         yield conn
     finally:
-        if conn:
-            conn.close()
+        conn.close()
+
+
+class SQLChunks:
+    # Output value for assets that stream their rows to the table chunk by chunk instead of returning one DataFrame,
+    # rows matching replace_where are deleted first in the same transaction
+    def __init__(self, chunks: Iterable[PandasDataFrame], replace_where: Optional[dict] = None):
+        self.chunks = chunks
+        self.replace_where = replace_where or {}
 
 
 class SQLIOManager(ConfigurableIOManager):
@@ -52,35 +78,459 @@ class SQLIOManager(ConfigurableIOManager):
                 except:
                     context.log.info('Table does not exist!')
 
-        if isinstance(obj, pd.DataFrame):
-            with connect_sql(config=self._config) as con:
-                obj.to_sql(table, con=con, if_exists='append', schema=schema, index=False, chunksize=10000)
+        # Assets pick how they are written with metadata={'write_strategy': ...}, insert is the default
+        strategy = (context.metadata or {}).get('write_strategy', 'insert')
+        if strategy not in WRITE_STRATEGIES:
+            raise ValueError(f'Unknown write_strategy {strategy}, expected one of {WRITE_STRATEGIES}')
+
+        metadata = dict()
+        start = time.perf_counter()
+        target, indexes = table, list()
+        if cleanup == 'swap':
+            if not isinstance(obj, (pd.DataFrame, SQLChunks)):
+                raise TypeError(f'{schema}.{table} is written in swap mode, which needs a DataFrame or SQLChunks, '
+                                f'got {type(obj).__name__}')
+            target, indexes = self._create_shadow_table(context, table, schema)
+
+        if cleanup == 'merge':
+            metadata = self._merge(context, obj, table, schema, strategy)
+        elif cleanup == 'partition':
+            metadata = self._replace_partition(context, obj, table, schema, strategy)
+        elif isinstance(obj, SQLChunks):
+            metadata = self._append_chunks(context, obj, target, schema, strategy)
+        elif isinstance(obj, pd.DataFrame):
+            with connect_sql(config=self._config, local_infile=strategy == 'bulk') as con:
+                with con.begin():
+                    strategy, rows = self._write(context, con, obj, target, schema, strategy)
+            metadata = {'Rows Written': rows, 'Write Strategy': strategy}
+
+        if target != table:
+            self._swap_tables(context, table, schema, indexes, metadata['Rows Written'])
+            metadata['Previous Copy'] = f'{schema}.{table}{OLD_SUFFIX}'
+
+        if metadata:
+            seconds = time.perf_counter() - start
+            metadata.update({'Write Seconds': round(seconds, 2),
+                             'Rows/sec': round(metadata['Rows Written'] / seconds, 1) if seconds else 0.0})
+        context.add_output_metadata({**metadata, 'Connection Pools': MetadataValue.json(pool_metrics())})
+
+    def _write(self, context: OutputContext, con, df: PandasDataFrame, table: str, schema: str,
+               strategy: str) -> tuple:
+        # Returns the strategy that was used and the number of rows the server took
+        if strategy == 'bulk':
+            loaded = self._try_load_data_infile(context, con, df, table, schema)
+            if loaded is not None:
+                return strategy, loaded
+            strategy = 'multi'
+
+        if strategy == 'multi':
+            written = df.to_sql(table, con=con, if_exists='append', schema=schema, index=False,
+                                chunksize=MULTI_CHUNKSIZE, method='multi')
+        else:
+            written = df.to_sql(table, con=con, if_exists='append', schema=schema, index=False,
+                                chunksize=INSERT_CHUNKSIZE)
+        return strategy, len(df) if written is None else written
+
+    @staticmethod
+    def _to_tsv(df: PandasDataFrame) -> str:
+        # Columns are formatted the way LOAD DATA reads them, with \N for NULL and tabs, newlines and
+        # backslashes escaped
+        columns = list()
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                text = values.dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+            elif pd.api.types.is_timedelta64_dtype(values):
+                text = values.dt.total_seconds().astype(str)
+            elif pd.api.types.is_bool_dtype(values):
+                text = values.astype(int).astype(str)
+            else:
+                text = (values.astype(str)
+                        .str.replace('\\', '\\\\', regex=False)
+                        .str.replace('\t', '\\t', regex=False)
+                        .str.replace('\n', '\\n', regex=False))
+            columns.append(text.where(values.notna(), '\\N'))
+
+        lines = columns[0]
+        for text in columns[1:]:
+            lines = lines + '\t' + text
+        return '\n'.join(lines) + '\n'
+
+    def _try_load_data_infile(self, context: OutputContext, con, df: PandasDataFrame, table: str,
+                              schema: str) -> Optional[int]:
+        # The load runs in a savepoint, so a failure part way through leaves none of its rows behind for the
+        # fallback to insert a second time, None means LOAD DATA is not available
+        try:
+            with con.begin_nested():
+                return self._load_data_infile(con, df, table, schema)
+        except Exception as err:
+            errno = getattr(getattr(err, 'orig', err), 'errno', None)
+            if errno not in LOCAL_INFILE_DISABLED_ERRNOS:
+                raise
+            # local_infile is off, the rows are still written, just more slowly
+            context.log.warning(f'LOAD DATA LOCAL INFILE into {schema}.{table} is disabled, falling back to multi '
+                                f'row inserts: {err}')
+            return None
+
+    def _load_data_infile(self, con, df: PandasDataFrame, table: str, schema: str) -> int:
+        column_list = ', '.join(f'`{col}`' for col in df.columns)
+        loaded = 0
+        # Runs on the same DBAPI connection, so it is part of the caller's transaction
+        cursor = con.connection.cursor()
+        try:
+            for start in range(0, len(df), BULK_CHUNKSIZE):
+                chunk = df.iloc[start:start + BULK_CHUNKSIZE]
+                with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='',
+                                                 delete=False) as file:
+                    file.write(self._to_tsv(chunk))
+                try:
+                    cursor.execute(f"LOAD DATA LOCAL INFILE '{file.name.replace(os.sep, '/')}' "
+                                   f"INTO TABLE {schema}.{table} CHARACTER SET utf8mb4 "
+                                   f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                                   f"LINES TERMINATED BY '\\n' ({column_list})")
+                finally:
+                    os.remove(file.name)
+
+                # LOCAL implies IGNORE, duplicate keys, bad conversions and NULLs in NOT NULL columns only raise
+                # warnings and the rows are skipped or coerced, so anything but a clean load fails the transaction
+                rowcount = cursor.rowcount
+                cursor.execute('SHOW WARNINGS LIMIT 5')
+                warnings = cursor.fetchall()
+                if rowcount != len(chunk) or warnings:
+                    raise Exception(f'Error: LOAD DATA into {schema}.{table} loaded {rowcount} of {len(chunk)} rows '
+                                    f'with warnings {warnings}')
+                loaded += rowcount
+        finally:
+            cursor.close()
+        return loaded
+
+    def _append_chunks(self, context: OutputContext, obj: SQLChunks, table: str, schema: str, strategy: str) -> dict:
+        rows = 0
+        chunks = 0
+        with connect_sql(config=self._config, local_infile=strategy == 'bulk') as con:
+            with con.begin():
+                if obj.replace_where:
+                    statement = self._get_delete_statement(table, schema, list(obj.replace_where))
+                    context.log.info('Query to run: ' + statement)
+                    result = con.execute(text(statement), obj.replace_where)
+                    context.log.info('Number of rows deleted: ' + str(result.rowcount))
+
+                # Only one chunk is held in memory at a time
+                for chunk in obj.chunks:
+                    # A failed bulk load falls back to multi row inserts for the rest of the chunks too
+                    strategy, written = self._write(context, con, chunk, table, schema, strategy)
+                    rows += written
+                    chunks += 1
+
+        context.log.info(f'Written {rows} rows in {chunks} chunks to {schema}.{table}')
+        return {'Rows Written': rows, 'Chunks': chunks, 'Write Strategy': strategy}
+
+    def _merge(self, context: OutputContext, obj, table: str, schema: str, strategy: str) -> dict:
+        # Assets in merge mode declare their natural key with metadata={'merge_key': [...]}
+        merge_key = list((context.metadata or {}).get('merge_key') or [])
+        if not merge_key:
+            raise ValueError(f'{schema}.{table} is written in merge mode but the asset has no merge_key metadata')
+
+        if isinstance(obj, SQLChunks):
+            batches = obj.chunks
+        else:
+            batches = (obj.iloc[start:start + MERGE_BATCHSIZE] for start in range(0, len(obj), MERGE_BATCHSIZE))
+
+        staging = f'{table}__merge'
+        rows = 0
+        affected = 0
+        batch_count = 0
+        with connect_sql(config=self._config, local_infile=strategy == 'bulk') as con:
+            try:
+                with con.begin():
+                    upsert = self._has_unique_key(con, table, schema, merge_key)
+                    if not upsert:
+                        context.log.warning(f'{schema}.{table} has no unique key on {merge_key}, merging with '
+                                            f'DELETE and INSERT instead of ON DUPLICATE KEY UPDATE')
+
+                    # Temporary tables neither commit the transaction nor show up for other connections
+                    con.execute(text(f'DROP TEMPORARY TABLE IF EXISTS {schema}.{staging}'))
+                    con.execute(text(f'CREATE TEMPORARY TABLE {schema}.{staging} LIKE {schema}.{table}'))
+
+                    for batch in batches:
+                        # A NULL never matches in a unique key and the key columns are NOT NULL, so rows without
+                        # a full key fail the merge rather than being dropped, usually a driver missing from
+                        # REFERENCE.DIM_DRIVER
+                        null_key = batch[merge_key].isna().any(axis=1)
+                        if null_key.any():
+                            raise ValueError(f'{int(null_key.sum())} rows have a NULL in {merge_key} merging into '
+                                             f'{schema}.{table}, first rows:\n'
+                                             f'{batch.loc[null_key].head().to_string()}')
+
+                        # The last row for a key wins, like it would have had the rows been merged one by one
+                        batch = batch.drop_duplicates(subset=merge_key, keep='last')
+                        con.execute(text(f'DELETE FROM {schema}.{staging}'))
+                        strategy = self._stage(context, con, batch, staging, schema, strategy)
+
+                        columns = list(batch.columns)
+                        if upsert:
+                            result = con.execute(text(self._get_upsert_statement(table, schema, staging, columns,
+                                                                                 merge_key)))
+                        else:
+                            con.execute(text(self._get_delete_join_statement(table, schema, staging, merge_key)))
+                            result = con.execute(text(self._get_insert_select_statement(table, schema, staging,
+                                                                                        columns)))
+                        rows += len(batch)
+                        affected += result.rowcount
+                        batch_count += 1
+            finally:
+                con.execute(text(f'DROP TEMPORARY TABLE IF EXISTS {schema}.{staging}'))
+
+        context.log.info(f'Merged {rows} rows in {batch_count} batches into {schema}.{table} on {merge_key}')
+        return {'Rows Written': rows,
+                'Rows Affected': affected,
+                'Batches': batch_count,
+                'Merge': 'upsert' if upsert else 'delete+insert',
+                'Write Strategy': strategy}
+
+    def _stage(self, context: OutputContext, con, df: PandasDataFrame, staging: str, schema: str, strategy: str) -> str:
+        if strategy == 'bulk':
+            if self._try_load_data_infile(context, con, df, staging, schema) is not None:
+                return strategy
+            strategy = 'multi'
+
+        # pandas' to_sql cannot see temporary tables, so the staging rows are bound to an INSERT directly
+        names = [f'p{i}' for i in range(len(df.columns))]
+        statement = text(f"INSERT INTO {schema}.{staging} ({', '.join(f'`{col}`' for col in df.columns)}) "
+                         f"VALUES ({', '.join(f':{name}' for name in names)})")
+        records = df.astype(object).where(df.notna(), None)
+        for start in range(0, len(records), INSERT_CHUNKSIZE):
+            con.execute(statement, [dict(zip(names, row))
+                                    for row in records.iloc[start:start + INSERT_CHUNKSIZE].itertuples(index=False)])
+        return strategy
+
+    def _has_unique_key(self, con, table: str, schema: str, merge_key: Sequence[str]) -> bool:
+        result = con.execute(text('SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS '
+                                  'WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND NON_UNIQUE = 0'),
+                             {'schema': schema, 'table': table})
+        indexes = dict()
+        for index_name, column_name in result:
+            indexes.setdefault(index_name, set()).add(column_name.upper())
+        return {col.upper() for col in merge_key} in indexes.values()
+
+    def _get_upsert_statement(self,
+                              table: str,
+                              schema: str,
+                              staging: str,
+                              columns: Sequence[str],
+                              merge_key: Sequence[str]):
+        target = f'{schema}.{table}'
+        data_columns = [col for col in columns if col not in merge_key and col not in MERGE_TOUCH_COLUMNS]
+
+        # MySQL applies the assignments left to right, so the touch columns are compared before the row is updated
+        assignments = list()
+        if data_columns:
+            unchanged = ' AND '.join(f'{target}.{col} <=> src.{col}' for col in data_columns)
+            assignments += [f'{target}.{col} = IF({unchanged}, {target}.{col}, src.{col})'
+                            for col in columns if col in MERGE_TOUCH_COLUMNS]
+        assignments += [f'{target}.{col} = src.{col}' for col in data_columns] or \
+                       [f'{target}.{merge_key[0]} = src.{merge_key[0]}']
+
+        col_list = ', '.join(columns)
+        return f"INSERT INTO {target} ({col_list}) " \
+               f"SELECT {', '.join(f'src.{col}' for col in columns)} FROM {schema}.{staging} AS src " \
+               f"ON DUPLICATE KEY UPDATE {', '.join(assignments)}"
+
+    def _get_delete_join_statement(self, table: str, schema: str, staging: str, merge_key: Sequence[str]):
+        on = ' AND '.join(f'tgt.{col} <=> src.{col}' for col in merge_key)
+        return f"DELETE tgt FROM {schema}.{table} AS tgt JOIN {schema}.{staging} AS src ON {on}"
+
+    def _get_insert_select_statement(self, table: str, schema: str, staging: str, columns: Sequence[str]):
+        col_list = ', '.join(columns)
+        return f"INSERT INTO {schema}.{table} ({col_list}) SELECT {col_list} FROM {schema}.{staging}"
+
+    def _replace_partition(self, context: OutputContext, obj, table: str, schema: str, strategy: str) -> dict:
+        # Partitioned assets declare the column their partition lives in with metadata={'partition_column': ...},
+        # partition_days widens the window for assets that write several days per partition (the 7 day forecast)
+        asset_metadata = context.metadata or {}
+        column = asset_metadata.get('partition_column')
+        if not column:
+            raise ValueError(f'{schema}.{table} is written in partition mode but the asset has no partition_column '
+                             f'metadata')
+
+        start, end = self._get_partition_window(context, asset_metadata)
+        chunks = obj.chunks if isinstance(obj, SQLChunks) else [obj]
+        rows = 0
+        with connect_sql(config=self._config, local_infile=strategy == 'bulk') as con:
+            with con.begin():
+                # A range on the bare column can use its index, date(column) IN (...) can not
+                statement = self._get_delete_range_statement(table, schema, column)
+                context.log.info(f'Query to run: {statement} [{start}, {end})')
+                result = con.execute(text(statement), {'start': start, 'end': end})
+                context.log.info('Number of rows deleted: ' + str(result.rowcount))
+
+                for chunk in chunks:
+                    values = pd.to_datetime(chunk[column])
+                    if values.dt.tz is not None:
+                        values = values.dt.tz_convert(None)
+                    outside = int(((values < start) | (values >= end)).sum())
+                    if outside:
+                        context.log.warning(f'{outside} rows of {schema}.{table} fall outside the partition '
+                                            f'[{start}, {end}) and will not be replaced by a re-run')
+                    strategy, written = self._write(context, con, chunk, table, schema, strategy)
+                    rows += written
+
+        return {'Rows Written': rows,
+                'Rows Deleted': result.rowcount,
+                'Partition Window': f'[{start}, {end})',
+                'Write Strategy': strategy}
+
+    @staticmethod
+    def _get_partition_window(context, asset_metadata: dict):
+        window = context.asset_partitions_time_window
+        start = window.start.replace(tzinfo=None)
+        end = window.end.replace(tzinfo=None)
+        if asset_metadata.get('partition_days'):
+            end = start + timedelta(days=asset_metadata['partition_days'])
+        return start, end
+
+    def _get_delete_range_statement(self, table: str, schema: str, column: str):
+        return f"DELETE FROM {schema}.{table} WHERE {column} >= :start AND {column} < :end"
+
+    def _create_shadow_table(self, context: OutputContext, table: str, schema: str):
+        shadow = f'{table}{SHADOW_SUFFIX}'
+        with connect_sql(config=self._config) as con:
+            exists = con.execute(text('SELECT COUNT(*) FROM information_schema.TABLES '
+                                      'WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table'),
+                                 {'schema': schema, 'table': table}).scalar()
+            if not exists:
+                context.log.info(f'{schema}.{table} does not exist, loading it directly')
+                return table, list()
+
+            con.execute(text(f'DROP TABLE IF EXISTS {schema}.{shadow}'))
+            con.execute(text(f'CREATE TABLE {schema}.{shadow} LIKE {schema}.{table}'))
+
+            # Non unique indexes are built once on the loaded table rather than maintained row by row, unique keys
+            # stay so duplicate rows fail the load instead of the swap
+            indexes = [index for index in self._get_secondary_indexes(con, shadow, schema) if not index[1]]
+            for name, unique, columns in indexes:
+                con.execute(text(f'ALTER TABLE {schema}.{shadow} DROP INDEX `{name}`'))
+
+        context.log.info(f'Loading into shadow table {schema}.{shadow}')
+        return shadow, indexes
+
+    def _get_secondary_indexes(self, con, table: str, schema: str) -> list:
+        result = con.execute(text('SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART '
+                                  'FROM information_schema.STATISTICS '
+                                  "WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND INDEX_NAME <> 'PRIMARY' "
+                                  "AND INDEX_TYPE = 'BTREE' ORDER BY INDEX_NAME, SEQ_IN_INDEX"),
+                             {'schema': schema, 'table': table})
+        indexes = dict()
+        for index_name, non_unique, column_name, sub_part in result:
+            column = f'`{column_name}`({sub_part})' if sub_part else f'`{column_name}`'
+            indexes.setdefault(index_name, (not non_unique, list()))[1].append(column)
+        return [(name, unique, columns) for name, (unique, columns) in indexes.items()]
+
+    def _swap_tables(self, context: OutputContext, table: str, schema: str, indexes: list, rows: int):
+        shadow, old = f'{table}{SHADOW_SUFFIX}', f'{table}{OLD_SUFFIX}'
+        with connect_sql(config=self._config) as con:
+            # Every index is in place and every row is loaded before the RENAME, otherwise the live table stays
+            try:
+                loaded = con.execute(text(f'SELECT COUNT(*) FROM {schema}.{shadow}')).scalar()
+                if loaded != rows:
+                    raise Exception(f'Error: {schema}.{shadow} holds {loaded} of the {rows} rows written, '
+                                    f'not swapping it in')
+                for name, unique, columns in indexes:
+                    context.log.info(f'Building index {name} on {schema}.{shadow}')
+                    con.execute(text(f"ALTER TABLE {schema}.{shadow} ADD {'UNIQUE ' if unique else ''}INDEX "
+                                     f"`{name}` ({', '.join(columns)})"))
+            except Exception:
+                con.execute(text(f'DROP TABLE IF EXISTS {schema}.{shadow}'))
+                raise
+
+            con.execute(text(f'DROP TABLE IF EXISTS {schema}.{old}'))
+            # A multi table RENAME is atomic, readers see either the old or the new table, never a partial one
+            con.execute(text(f'RENAME TABLE {schema}.{table} TO {schema}.{old}, {schema}.{shadow} TO {schema}.{table}'))
+        context.log.info(f'Swapped {schema}.{shadow} in as {schema}.{table}, the previous copy is {schema}.{old}')
+
+    def restore_previous_copy(self, schema: str, table: str):
+        # Puts the __old copy back in place; the replaced table becomes __old, so a second call undoes the restore
+        old, tmp = f'{table}{OLD_SUFFIX}', f'{table}__restore'
+        with connect_sql(config=self._config) as con:
+            exists = con.execute(text('SELECT COUNT(*) FROM information_schema.TABLES '
+                                      'WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table'),
+                                 {'schema': schema, 'table': old}).scalar()
+            if not exists:
+                raise Exception(f'Error: {schema}.{old} does not exist, {schema}.{table} has no previous copy')
+            con.execute(text(f'RENAME TABLE {schema}.{table} TO {schema}.{tmp}, '
+                             f'{schema}.{old} TO {schema}.{table}, '
+                             f'{schema}.{tmp} TO {schema}.{old}'))
+
+    def _get_delete_statement(self, table: str, schema: str, columns: Sequence[str]):
+        where = ' AND '.join(f'{col} = :{col}' for col in columns)
+        return f"DELETE FROM {schema}.{table} WHERE {where}"
 
     def _get_cleanup_statement(self, table: str, schema: str):
         return f"truncate {schema}.{table}"
 
     def load_input(self, context: InputContext) -> PandasDataFrame:
         schema, table, query = context.asset_key.path[0], context.asset_key.path[-3], context.asset_key.path[-2]
+        # Inputs narrow what is read with metadata={'columns': [...], 'filters': [(col, op, value)],
+        # 'partition_column': ..., 'chunksize': ...} on their AssetIn
+        asset_metadata = context.metadata or {}
+
+        where, params = self._get_where_clause(context, asset_metadata)
+        statement = self._get_select_statement(table, schema, asset_metadata.get('columns'), where)
+        context.log.info(f'Query to run: {statement} {params}')
+
+        if asset_metadata.get('chunksize'):
+            return self._iter_chunks(statement, params, asset_metadata['chunksize'])
 
         with connect_sql(config=self._config) as con:
-            result = read_sql(
-                sql=self._get_select_statement(
-                    table,
-                    schema,
-                    (context.metadata or {}).get('columns'),
-                ),
-                con=con
-            )
+            result = read_sql(sql=text(statement), con=con, params=params)
         result.columns = map(str.lower, result.columns)
         return result
 
+    def _iter_chunks(self, statement: str, params: dict, chunksize: int) -> Iterator[PandasDataFrame]:
+        # The connection stays checked out of the pool until the consumer has read the last chunk, and the rows are
+        # streamed from the server instead of being buffered client side
+        with connect_sql(config=self._config) as con:
+            con = con.execution_options(stream_results=True)
+            for chunk in read_sql(sql=text(statement), con=con, params=params, chunksize=chunksize):
+                chunk.columns = map(str.lower, chunk.columns)
+                yield chunk
+
+    def _get_where_clause(self, context: InputContext, asset_metadata: dict):
+        clauses = list()
+        params = dict()
+        for i, (column, op, value) in enumerate(asset_metadata.get('filters') or []):
+            op = op.lower()
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f'Unknown filter operator {op}, expected one of {FILTER_OPERATORS}')
+
+            if op in ['in', 'not in']:
+                names = [f'f{i}_{j}' for j in range(len(value))]
+                if names:
+                    clauses.append(f"{column} {op.upper()} ({', '.join(f':{name}' for name in names)})")
+                    params.update(zip(names, value))
+                elif op == 'in':
+                    clauses.append('1 = 0')
+            else:
+                clauses.append(f'{column} {op} :f{i}')
+                params[f'f{i}'] = value
+
+        # Partitioned inputs only read their own partition's rows
+        partition_column = asset_metadata.get('partition_column')
+        if partition_column and context.has_asset_partitions:
+            params['partition_start'], params['partition_end'] = self._get_partition_window(context, asset_metadata)
+            clauses.append(f'{partition_column} >= :partition_start AND {partition_column} < :partition_end')
+
+        return ' AND '.join(clauses), params
+
     def _get_select_statement(self,
                               table: str,
                               schema: str,
-                              columns: Optional[Sequence[str]]
+                              columns: Optional[Sequence[str]],
+                              where: Optional[str] = None
                               ):
         col_list = ', '.join(columns) if columns else '*'
-        return f'SELECT {col_list} FROM {schema}.{table}'
+        statement = f'SELECT {col_list} FROM {schema}.{table}'
+        return f'{statement} WHERE {where}' if where else statement
 
 
 class MySQLDirectConnection:
@@ -91,31 +541,28 @@ class MySQLDirectConnection:
         self.password = password
         self.server = server
 
-        self.connection_string = f'mysql+mysqlconnector://{user}:{password}@{server}:{port}/{database}'
-        self.engine = create_engine(self.connection_string)
-        self.conn = self.engine.connect()
-
-        self.cursor_conn = mysql.connector.connect(
-            user=user, password=password, host=server, database=database, port=port
-        )
-
-        self.cursor = self.cursor_conn.cursor()
+        self.engine = get_engine(user=user, password=password, server=server, port=port, database=database)
 
     def run_query(self, query):
         try:
             print('Query to run: ' + query)
-            df = pd.read_sql(query, self.conn)
-            self.conn.close()
+            with self.engine.connect() as conn:
+                df = pd.read_sql(query, conn)
         except pyodbc.ProgrammingError as error:
             print(f'Warning: \n {error}')
         return df
 
     def run_query_no_output(self, query):
+        # The DDL scripts run on the driver connection underneath the pooled engine, not a second connection
+        conn = self.engine.raw_connection()
         try:
             print('Query to run: ' + query)
-            self.cursor.execute(query)
-            self.cursor.close()
-            self.cursor_conn.close()
+            cursor = conn.cursor()
+            cursor.execute(query)
+            cursor.close()
+            conn.commit()
         except pyodbc.ProgrammingError as error:
             print(f'Warning: \n {error}')
+        finally:
+            conn.close()
         return None
@@ -0,0 +1,49 @@
+-- Brings SESSION.PRACTICE_RESULTS and SESSION.RACE_LAPS tables created before their unique keys in line with
+-- the table scripts. Run it once, before the merge assets first write to the tables.
+-- Each table is rebuilt with NOT NULL key columns and the unique key, keeping the most recently loaded row for
+-- every key. The original table is kept as __pre_key, including any rows with a NULL key, and can be dropped
+-- once they have been checked.
+
+DROP TABLE IF EXISTS SESSION.PRACTICE_RESULTS__dedupe;
+
+CREATE TABLE SESSION.PRACTICE_RESULTS__dedupe LIKE SESSION.PRACTICE_RESULTS;
+
+ALTER TABLE SESSION.PRACTICE_RESULTS__dedupe
+    MODIFY EVENT_CD INT(6) NOT NULL,
+    MODIFY SESSION_CD INT(1) NOT NULL,
+    MODIFY DRIVER_ID VARCHAR(30) NOT NULL,
+    ADD UNIQUE KEY PRACTICE_RESULTS_UK (EVENT_CD, SESSION_CD, DRIVER_ID);
+
+INSERT IGNORE INTO SESSION.PRACTICE_RESULTS__dedupe
+SELECT *
+FROM SESSION.PRACTICE_RESULTS
+WHERE EVENT_CD IS NOT NULL
+  AND SESSION_CD IS NOT NULL
+  AND DRIVER_ID IS NOT NULL
+ORDER BY LOAD_TS DESC;
+
+RENAME TABLE SESSION.PRACTICE_RESULTS TO SESSION.PRACTICE_RESULTS__pre_key,
+             SESSION.PRACTICE_RESULTS__dedupe TO SESSION.PRACTICE_RESULTS;
+
+DROP TABLE IF EXISTS SESSION.RACE_LAPS__dedupe;
+
+CREATE TABLE SESSION.RACE_LAPS__dedupe LIKE SESSION.RACE_LAPS;
+
+ALTER TABLE SESSION.RACE_LAPS__dedupe
+    MODIFY EVENT_CD INT(6) NOT NULL,
+    MODIFY SESSION_CD INT(1) NOT NULL,
+    MODIFY DRIVER_ID VARCHAR(30) NOT NULL,
+    MODIFY LAP_NUMBER INT(2) NOT NULL,
+    ADD UNIQUE KEY RACE_LAPS_UK (EVENT_CD, SESSION_CD, DRIVER_ID, LAP_NUMBER);
+
+INSERT IGNORE INTO SESSION.RACE_LAPS__dedupe
+SELECT *
+FROM SESSION.RACE_LAPS
+WHERE EVENT_CD IS NOT NULL
+  AND SESSION_CD IS NOT NULL
+  AND DRIVER_ID IS NOT NULL
+  AND LAP_NUMBER IS NOT NULL
+ORDER BY LOAD_TS DESC;
+
+RENAME TABLE SESSION.RACE_LAPS TO SESSION.RACE_LAPS__pre_key,
+             SESSION.RACE_LAPS__dedupe TO SESSION.RACE_LAPS;
@@ -1,14 +1,15 @@
 DROP TABLE IF EXISTS SESSION.PRACTICE_RESULTS;
 
 create table SESSION.PRACTICE_RESULTS (
-EVENT_CD INT(6),
-SESSION_CD INT(1),
-DRIVER_ID VARCHAR(30),
+EVENT_CD INT(6) NOT NULL,
+SESSION_CD INT(1) NOT NULL,
+DRIVER_ID VARCHAR(30) NOT NULL,
 TEAM_ID VARCHAR(30),
 POSITION INT(2),
 LAPTIME FLOAT,
 SECTOR1_TIME FLOAT,
 SECTOR2_TIME FLOAT,
 SECTOR3_TIME FLOAT,
-LOAD_TS DATETIME
+LOAD_TS DATETIME,
+UNIQUE KEY PRACTICE_RESULTS_UK (EVENT_CD, SESSION_CD, DRIVER_ID)
 )
\ No newline at end of file
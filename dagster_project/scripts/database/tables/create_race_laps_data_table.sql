@@ -1,12 +1,12 @@
 DROP TABLE IF EXISTS SESSION.RACE_LAPS;
 
 create table SESSION.RACE_LAPS (
-    EVENT_CD INT(6),
-    SESSION_CD INT(1),
-    DRIVER_ID VARCHAR(30),
+    EVENT_CD INT(6) NOT NULL,
+    SESSION_CD INT(1) NOT NULL,
+    DRIVER_ID VARCHAR(30) NOT NULL,
     TEAM_ID VARCHAR(30),
     LAPTIME FLOAT,
-    LAP_NUMBER INT(2),
+    LAP_NUMBER INT(2) NOT NULL,
     PIT_IN_FLG INT(1),
     PIT_OUT_FLG INT(1),
     POSITION INT(2),
@@ -25,5 +25,6 @@ create table SESSION.RACE_LAPS (
     LAP_DELETED INT(1),
     LAP_DELETED_REASON VARCHAR(100),
     FF1_LAP_IS_ACCURATE INT(1),
-    LOAD_TS DATETIME
+    LOAD_TS DATETIME,
+    UNIQUE KEY RACE_LAPS_UK (EVENT_CD, SESSION_CD, DRIVER_ID, LAP_NUMBER)
 )
\ No newline at end of file
@@ -0,0 +1,15 @@
+DROP TABLE IF EXISTS WEATHER.SESSION_WEATHER;
+
+CREATE TABLE WEATHER.SESSION_WEATHER (
+EVENT_CD int(6),
+SESSION_CD int(1),
+WEATHER_DATETIME datetime,
+AIR_TEMP float,
+TRACK_TEMP float,
+HUMIDITY float,
+PRESSURE float,
+RAINFALL int(1),
+WIND_DIRECTION float,
+WIND_SPEED float,
+LOAD_TS datetime
+);
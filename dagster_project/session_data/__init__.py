@@ -1,13 +1,12 @@
 import os
 from dagster import (Definitions, ResourceDefinition)
-from dagster_mysql import MySQLResource
 from .assets import *
 from .jobs import *
 from .schedules import *
 from .sensors import *
-from resources import sql_io_manager, jolpi_api, fast_f1_resource
+from resources import sql_io_manager, jolpi_api, fast_f1_resource, mysql_pool
 
-all_assets = [*full_session_update_assets, *session_update_assets, *pre_assets]
+all_assets = [*full_session_update_assets, *session_update_assets, *pre_assets, *telemetry_assets]
 
 defs = Definitions(
     assets=all_assets,
@@ -17,10 +16,14 @@ defs = Definitions(
         full_race_laps_data_load_job,
         full_qualifying_data_load_job,
         full_practice_data_load_job,
+        full_practice_laps_data_load_job,
+        full_qualifying_laps_data_load_job,
         practice_data_load_job,
         quali_data_load_job,
         race_data_load_job,
-        race_laps_data_load_job
+        race_laps_data_load_job,
+        session_telemetry_load_job,
+        fastf1_cache_warmup_job
     ],
     schedules=[
     ],
@@ -28,7 +31,8 @@ defs = Definitions(
         practice_data_load_sensor,
         qualifying_data_load_sensor,
         race_data_load_sensor,
-        race_laps_data_load_sensor
+        race_laps_data_load_sensor,
+        fastf1_cache_warmup_sensor
     ],
     resources={
         'sql_io_manager': sql_io_manager.SQLIOManager(
@@ -38,7 +42,7 @@ defs = Definitions(
             port=os.getenv('SQL_PORT'),
             server=os.getenv('SQL_SERVER'),
         ),
-        'mysql': MySQLResource(
+        'mysql': mysql_pool.MySQLPoolResource(
             user=os.getenv('SQL_USER'),
             password=os.getenv('SQL_PASSWORD'),
             port=os.getenv('SQL_PORT'),
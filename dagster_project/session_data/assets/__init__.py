@@ -2,6 +2,7 @@ from dagster import load_assets_from_package_module, load_assets_from_modules
 from .full_session import *
 from .session import *
 from .pre_assets import *
+from .telemetry import *
 
 FULL_SESSION_UPDATE = 'full_session_update'
 full_session_update_assets = load_assets_from_package_module(package_module=full_session,
@@ -14,3 +15,7 @@ session_update_assets = load_assets_from_package_module(package_module=session,
 PRE_ASSETS = 'pre_assets'
 pre_assets = load_assets_from_package_module(package_module=pre_assets,
                                              group_name=PRE_ASSETS)
+
+TELEMETRY = 'telemetry'
+telemetry_assets = load_assets_from_package_module(package_module=telemetry,
+                                                   group_name=TELEMETRY)
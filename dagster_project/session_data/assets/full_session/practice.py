@@ -1,28 +1,51 @@
 import pandas as pd
 import datetime
 from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from utils.backfill_utils import BackfillUtils
+from utils.lap_utils import LapUtils
+from resources.sql_io_manager import SQLChunks
 
 
-@asset(required_resource_keys={"fastf1"})
-def get_full_practice_data_api(context: AssetExecutionContext,
-                               get_events_sql: pd.DataFrame):
-    df = pd.DataFrame()
+def practice_work_items(fastf1, get_events_sql: pd.DataFrame, laps: bool) -> list:
+    work_items = list()
     for index, row in get_events_sql.iterrows():
-        context.log.info(f"Getting all practice sessions for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
+        sessions = fastf1.get_session_list(year=row['EVENT_YEAR'],
+                                           round_number=row['ROUND_NUMBER'])
+        for session in [x for x in sessions if 'Practice' in x]:
+            practice_num = int(session[-1])
+            if laps:
+                method = 'get_session_laps'
+                kwargs = {'year': row['EVENT_YEAR'],
+                          'round_number': row['ROUND_NUMBER'],
+                          'identifier': f'FP{practice_num}'}
+                columns = {'SESSION_CD': practice_num}
+            else:
+                method = 'get_practice_results'
+                kwargs = {'year': row['EVENT_YEAR'],
+                          'round_number': row['ROUND_NUMBER'],
+                          'practice_num': practice_num,
+                          'drivers': True}
+                columns = {}
+            work_items.append(BackfillUtils.work_item(name=f"{row['EVENT_YEAR']} - {row['EVENT_NAME']} - {session}",
+                                                      method=method,
+                                                      kwargs=kwargs,
+                                                      EVENT_CD=row['EVENT_CD'],
+                                                      **columns))
+    return work_items
 
-        api_data = context.resources.fastf1.get_practice_results(year=row['EVENT_YEAR'],
-                                                                 round_number=row['ROUND_NUMBER'],
-                                                                 drivers=True).copy()
 
-        api_data.loc[:, 'EVENT_CD'] = row['EVENT_CD']
+@asset(required_resource_keys={"fastf1"})
+def get_full_practice_data_api(context: AssetExecutionContext,
+                               get_events_sql: pd.DataFrame):
+    work_items = practice_work_items(context.resources.fastf1, get_events_sql, laps=False)
 
-        df = pd.concat([df, api_data],
-                       ignore_index=True)
+    df, timings = BackfillUtils.run(context, work_items, context.resources.fastf1)
 
     return Output(value=df,
                   metadata={
                       'Markdown': MetadataValue.md(df.head().to_markdown()),
-                      'Rows': len(df)}
+                      'Rows': len(df),
+                      **BackfillUtils.timing_metadata(timings)}
                   )
 
 
@@ -60,7 +83,7 @@ def clean_full_practice_data(context: AssetExecutionContext,
                   )
 
 
-@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'PRACTICE_RESULTS', 'cleanup'])
+@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'PRACTICE_RESULTS', 'swap'])
 def full_practice_data_to_sql(context: AssetExecutionContext,
                               clean_full_practice_data: pd.DataFrame):
     df = clean_full_practice_data
@@ -72,3 +95,31 @@ def full_practice_data_to_sql(context: AssetExecutionContext,
                       'Rows': len(df),
                       'Load Time': str(datetime.datetime.now())}
                   )
+
+
+@asset(required_resource_keys={"fastf1"},
+       io_manager_key='sql_io_manager',
+       key_prefix=['SESSION', 'PRACTICE_LAPS', 'swap'],
+       metadata={'write_strategy': 'bulk'})
+def full_practice_lap_data_to_sql(context: AssetExecutionContext,
+                                  get_events_sql: pd.DataFrame,
+                                  get_drivers_sql: pd.DataFrame,
+                                  get_teams_sql: pd.DataFrame):
+    work_items = practice_work_items(context.resources.fastf1, get_events_sql, laps=True)
+
+    # Each session is cleaned and written as soon as its worker returns it, rather than holding every lap in memory
+    def chunks():
+        for df in BackfillUtils.iter_results(context, work_items, context.resources.fastf1):
+            df = LapUtils.clean_laps(df=df,
+                                     driver_df=get_drivers_sql,
+                                     team_df=get_teams_sql)
+            df['LOAD_TS'] = datetime.datetime.now()
+            yield df
+
+    context.log.info(f"Loading {len(work_items)} sessions of laps into SESSION.PRACTICE_LAPS current records will be "
+                     f"deleted.")
+    return Output(value=SQLChunks(chunks()),
+                  metadata={
+                      'Work Items': len(work_items),
+                      'Load Time': str(datetime.datetime.now())}
+                  )
@@ -1,47 +1,58 @@
 import pandas as pd
 import datetime
 from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from utils.backfill_utils import BackfillUtils
+from utils.lap_utils import LapUtils
+from resources.fast_f1_resource import session_identifier
+from resources.sql_io_manager import SQLChunks
 
 
-@asset(required_resource_keys={"fastf1"})
-def get_full_quali_data_api(context: AssetExecutionContext,
-                            get_events_sql: pd.DataFrame):
-    df = pd.DataFrame()
+def quali_work_items(get_events_sql: pd.DataFrame, laps: bool) -> list:
+    work_items = list()
     # Go through all the rows in the event df that was passed
     for index, row in get_events_sql.iterrows():
-        context.log.info(f"Getting Qualifying for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-        api_data = context.resources.fastf1.get_qualifying_results(year=row['EVENT_YEAR'],
-                                                                   round_number=row['ROUND_NUMBER']).copy()
-
-        api_data.loc[:, 'SESSION_CD'] = 4
-
+        session_cds = [4]
         if (row['EVENT_TYPE_CD'] == 2) and (row['EVENT_YEAR'] >= 2023):
-            context.log.info(f"Getting Sprit Qualifying for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-            driver_df = api_data[['Abbreviation', 'DriverNumber', 'DriverId', 'TeamId']]
-
-            api_sprint_data = context.resources.fastf1.get_qualifying_results(year=row['EVENT_YEAR'],
-                                                                              round_number=row['ROUND_NUMBER'],
-                                                                              sprint=True).drop(columns=['DriverId',
-                                                                                                         'TeamId']).copy()
-
-            api_sprint_data = pd.merge(api_sprint_data, driver_df, on=['Abbreviation', 'DriverNumber'])
-
-            api_sprint_data.loc[:, 'SESSION_CD'] = 5
+            session_cds.append(5)
+
+        for session_cd in session_cds:
+            if laps:
+                method = 'get_session_laps'
+                kwargs = {'year': row['EVENT_YEAR'],
+                          'round_number': row['ROUND_NUMBER'],
+                          'identifier': session_identifier(row['EVENT_YEAR'], session_cd)}
+            else:
+                method = 'get_qualifying_results'
+                kwargs = {'year': row['EVENT_YEAR'],
+                          'round_number': row['ROUND_NUMBER'],
+                          'sprint': session_cd == 5}
+            session = 'Sprint Qualifying' if session_cd == 5 else 'Qualifying'
+            work_items.append(BackfillUtils.work_item(name=f"{row['EVENT_YEAR']} - {row['EVENT_NAME']} - {session}",
+                                                      method=method,
+                                                      kwargs=kwargs,
+                                                      SESSION_CD=session_cd,
+                                                      EVENT_CD=row['EVENT_CD']))
+    return work_items
 
-            api_data = pd.concat([api_data, api_sprint_data],
-                                 ignore_index=True)
 
-        api_data.loc[:, 'EVENT_CD'] = row['EVENT_CD']
+@asset(required_resource_keys={"fastf1"})
+def get_full_quali_data_api(context: AssetExecutionContext,
+                            get_events_sql: pd.DataFrame):
+    df, timings = BackfillUtils.run(context, quali_work_items(get_events_sql, laps=False), context.resources.fastf1)
 
-        df = pd.concat([df, api_data],
-                       ignore_index=True)
+    # Sprint qualifying takes the driver and team ids from the main qualifying session of the same event
+    if (df['SESSION_CD'] == 5).any():
+        driver_df = df.loc[df['SESSION_CD'] == 4, ['EVENT_CD', 'Abbreviation', 'DriverNumber', 'DriverId', 'TeamId']]
+        sprint_df = pd.merge(df.loc[df['SESSION_CD'] == 5].drop(columns=['DriverId', 'TeamId']),
+                             driver_df,
+                             on=['EVENT_CD', 'Abbreviation', 'DriverNumber'])
+        df = pd.concat([df.loc[df['SESSION_CD'] != 5], sprint_df], ignore_index=True)
 
     return Output(value=df,
                   metadata={
                       'Markdown': MetadataValue.md(df.head().to_markdown()),
-                      'Rows': len(df)}
+                      'Rows': len(df),
+                      **BackfillUtils.timing_metadata(timings)}
                   )
 
 
@@ -90,7 +101,7 @@ def clean_full_quali_data(context: AssetExecutionContext,
                   )
 
 
-@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'QUALIFYING_RESULTS', 'cleanup'])
+@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'QUALIFYING_RESULTS', 'swap'])
 def full_quali_data_to_sql(context: AssetExecutionContext,
                            clean_full_quali_data: pd.DataFrame):
     df = clean_full_quali_data
@@ -102,3 +113,31 @@ def full_quali_data_to_sql(context: AssetExecutionContext,
                       'Rows': len(df),
                       'Load Time': str(datetime.datetime.now())}
                   )
+
+
+@asset(required_resource_keys={"fastf1"},
+       io_manager_key='sql_io_manager',
+       key_prefix=['SESSION', 'QUALIFYING_LAPS', 'swap'],
+       metadata={'write_strategy': 'bulk'})
+def full_quali_lap_data_to_sql(context: AssetExecutionContext,
+                               get_events_sql: pd.DataFrame,
+                               get_drivers_sql: pd.DataFrame,
+                               get_teams_sql: pd.DataFrame):
+    work_items = quali_work_items(get_events_sql, laps=True)
+
+    # Each session is cleaned and written as soon as its worker returns it, rather than holding every lap in memory
+    def chunks():
+        for df in BackfillUtils.iter_results(context, work_items, context.resources.fastf1):
+            df = LapUtils.clean_laps(df=df,
+                                     driver_df=get_drivers_sql,
+                                     team_df=get_teams_sql)
+            df['LOAD_TS'] = datetime.datetime.now()
+            yield df
+
+    context.log.info(f"Loading {len(work_items)} sessions of laps into SESSION.QUALIFYING_LAPS current records will "
+                     f"be deleted.")
+    return Output(value=SQLChunks(chunks()),
+                  metadata={
+                      'Work Items': len(work_items),
+                      'Load Time': str(datetime.datetime.now())}
+                  )
@@ -2,42 +2,44 @@ import numpy as np
 import pandas as pd
 import datetime
 from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from utils.backfill_utils import BackfillUtils
+from utils.lap_utils import LapUtils
 
 
-@asset(required_resource_keys={"fastf1"})
-def get_full_race_data_api(context: AssetExecutionContext,
-                           get_events_sql: pd.DataFrame):
-    df = pd.DataFrame()
+def race_work_items(get_events_sql: pd.DataFrame, laps: bool) -> list:
+    work_items = list()
     # Go through all the rows in the event df that was passed
     for index, row in get_events_sql.iterrows():
-        context.log.info(f"Getting Race Results for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-        api_data = context.resources.fastf1.get_race_results(year=row['EVENT_YEAR'],
-                                                             round_number=row['ROUND_NUMBER']).copy()
-
-        api_data.loc[:, 'SESSION_CD'] = 7
+        work_items.append(BackfillUtils.work_item(name=f"{row['EVENT_YEAR']} - {row['EVENT_NAME']} - Race",
+                                                  method='get_race_results',
+                                                  kwargs={'year': row['EVENT_YEAR'],
+                                                          'round_number': row['ROUND_NUMBER'],
+                                                          'laps': laps},
+                                                  SESSION_CD=7,
+                                                  EVENT_CD=row['EVENT_CD']))
 
         if (row['EVENT_TYPE_CD'] == 2) and (row['EVENT_YEAR'] >= 2023):
-            context.log.info(f"Getting Sprit Race Results for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-            api_sprint_data = context.resources.fastf1.get_race_results(year=row['EVENT_YEAR'],
-                                                                        round_number=row['ROUND_NUMBER'],
-                                                                        sprint=True).copy()
-
-            api_sprint_data.loc[:, 'SESSION_CD'] = 6
-
-            api_data = pd.concat([api_data, api_sprint_data],
-                                 ignore_index=True)
+            work_items.append(BackfillUtils.work_item(name=f"{row['EVENT_YEAR']} - {row['EVENT_NAME']} - Sprint",
+                                                      method='get_race_results',
+                                                      kwargs={'year': row['EVENT_YEAR'],
+                                                              'round_number': row['ROUND_NUMBER'],
+                                                              'sprint': True,
+                                                              'laps': laps},
+                                                      SESSION_CD=6,
+                                                      EVENT_CD=row['EVENT_CD']))
+    return work_items
 
-        api_data.loc[:, 'EVENT_CD'] = row['EVENT_CD']
 
-        df = pd.concat([df, api_data],
-                       ignore_index=True)
+@asset(required_resource_keys={"fastf1"})
+def get_full_race_data_api(context: AssetExecutionContext,
+                           get_events_sql: pd.DataFrame):
+    df, timings = BackfillUtils.run(context, race_work_items(get_events_sql, laps=False), context.resources.fastf1)
 
     return Output(value=df,
                   metadata={
                       'Markdown': MetadataValue.md(df.head().to_markdown()),
-                      'Rows': len(df)}
+                      'Rows': len(df),
+                      **BackfillUtils.timing_metadata(timings)}
                   )
 
 
@@ -76,7 +78,7 @@ def clean_full_race_data(context: AssetExecutionContext,
                   )
 
 
-@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'RACE_RESULTS', 'cleanup'])
+@asset(io_manager_key='sql_io_manager', key_prefix=['SESSION', 'RACE_RESULTS', 'swap'])
 def full_race_data_to_sql(context: AssetExecutionContext,
                           clean_full_race_data: pd.DataFrame):
     df = clean_full_race_data
@@ -93,39 +95,13 @@ def full_race_data_to_sql(context: AssetExecutionContext,
 @asset(required_resource_keys={"fastf1"})
 def get_full_race_lap_data_api(context: AssetExecutionContext,
                                get_events_sql: pd.DataFrame):
-    df = pd.DataFrame()
-    # Go through all the rows in the event df that was passed
-    for index, row in get_events_sql.iterrows():
-        context.log.info(f"Getting Race Results for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-        api_data = context.resources.fastf1.get_race_results(year=row['EVENT_YEAR'],
-                                                             round_number=row['ROUND_NUMBER'],
-                                                             laps=True).copy()
-
-        api_data.loc[:, 'SESSION_CD'] = 7
-
-        if (row['EVENT_TYPE_CD'] == 2) and (row['EVENT_YEAR'] >= 2023):
-            context.log.info(f"Getting Sprit Race Results for {row['EVENT_YEAR']} - {row['EVENT_NAME']}")
-
-            api_sprint_data = context.resources.fastf1.get_race_results(year=row['EVENT_YEAR'],
-                                                                        round_number=row['ROUND_NUMBER'],
-                                                                        sprint=True,
-                                                                        laps=True).copy()
-
-            api_sprint_data.loc[:, 'SESSION_CD'] = 6
-
-            api_data = pd.concat([api_data, api_sprint_data],
-                                 ignore_index=True)
-
-        api_data.loc[:, 'EVENT_CD'] = row['EVENT_CD']
-
-        df = pd.concat([df, api_data],
-                       ignore_index=True)
+    df, timings = BackfillUtils.run(context, race_work_items(get_events_sql, laps=True), context.resources.fastf1)
 
     return Output(value=df,
                   metadata={
                       'Markdown': MetadataValue.md(df.head().to_markdown()),
                       'Rows': len(df),
+                      **BackfillUtils.timing_metadata(timings),
                       'Load Time': str(datetime.datetime.now())}
                   )
 
@@ -135,77 +111,10 @@ def clean_full_race_lap_data(context: AssetExecutionContext,
                              get_full_race_lap_data_api: pd.DataFrame,
                              get_drivers_sql: pd.DataFrame,
                              get_teams_sql: pd.DataFrame):
-    df = get_full_race_lap_data_api
-    driver_df = get_drivers_sql
-    team_df = get_teams_sql
-    # Merging Team and Driver dfs with data df
-    context.log.info('Merging race lap data with driver and team data')
-    df = pd.merge(df, driver_df, how='left', left_on='Driver', right_on='DRIVER_CODE')
-    df = pd.merge(df, team_df, how='left', left_on='Team', right_on='NAME')
-
-    context.log.info('Creating Pit In/Out Columns')
-    df.loc[~df['PitInTime'].isna(), 'PIT_IN_FLG'] = 1
-    df.loc[df['PitInTime'].isna(), 'PIT_IN_FLG'] = 0
-    df.loc[~df['PitOutTime'].isna(), 'PIT_OUT_FLG'] = 1
-    df.loc[df['PitOutTime'].isna(), 'PIT_OUT_FLG'] = 0
-
-    context.log.info('Setting LapTime columns to seconds.')
-    df["LapTime"] = df["LapTime"].dt.total_seconds()
-    df["Sector1Time"] = df["Sector1Time"].dt.total_seconds()
-    df["Sector2Time"] = df["Sector2Time"].dt.total_seconds()
-    df["Sector3Time"] = df["Sector3Time"].dt.total_seconds()
-
-    context.log.info('Setting bool columns to 1 and 0.')
-    df["Deleted"] = df["Deleted"].astype(int)
-    df["IsAccurate"] = df["IsAccurate"].astype(int)
-
-    context.log.info('Setting blanks in track status to -2')
-    df["TrackStatus"] = df["TrackStatus"].replace('', -2)
-
-    context.log.info('Removing unused columns')
-    df.drop(columns=['Driver',
-                     'Team',
-                     'DRIVER_CODE',
-                     'QUALI_CD',
-                     'DRIVER_NUMBER',
-                     'NAME',
-                     'PitInTime',
-                     'PitOutTime',
-                     'Time',
-                     'DriverNumber',
-                     'Sector1SessionTime',
-                     'Sector2SessionTime',
-                     'Sector3SessionTime',
-                     'IsPersonalBest',
-                     'FreshTyre',
-                     'LapStartTime',
-                     'FastF1Generated'], inplace=True)
-
-    context.log.info('Renaming columns')
-    df.rename(columns={'LapNumber': 'LAP_NUMBER',
-                       'CONSTRUCTOR_ID': 'TEAM_ID',
-                       'Stint': 'STINT_NUMBER',
-                       'LapTime': 'LAPTIME',
-                       'Sector1Time': 'SECTOR1_TIME',
-                       'Sector2Time': 'SECTOR2_TIME',
-                       'Sector3Time': 'SECTOR3_TIME',
-                       'SpeedI1': 'SPEED_TRAP_1',
-                       'SpeedI2': 'SPEED_TRAP_2',
-                       'SpeedFL': 'SPEED_TRAP_FLAG',
-                       'SpeedST': 'SPEED_TRAP_STRAIGHT',
-                       'Compound': 'COMPOUND',
-                       'TyreLife': 'TYRE_LIFE',
-                       'LapStartDate': 'LAP_START_DATETIME',
-                       'TrackStatus': 'TRACK_STATUS',
-                       'Position': 'POSITION',
-                       'Deleted': 'LAP_DELETED',
-                       'DeletedReason': 'LAP_DELETED_REASON',
-                       'IsAccurate': 'FF1_LAP_IS_ACCURATE'},
-              inplace=True)
-
-    context.log.info('Removing rows where laptime is null')
-    df.dropna(subset=['LAPTIME'],
-              inplace=True)
+    context.log.info('Merging race lap data with driver and team data and renaming columns')
+    df = LapUtils.clean_laps(df=get_full_race_lap_data_api,
+                             driver_df=get_drivers_sql,
+                             team_df=get_teams_sql)
 
     return Output(value=df,
                   metadata={
@@ -216,7 +125,8 @@ def clean_full_race_lap_data(context: AssetExecutionContext,
 
 
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['SESSION', 'RACE_LAPS', 'cleanup'])
+       key_prefix=['SESSION', 'RACE_LAPS', 'swap'],
+       metadata={'write_strategy': 'bulk'})
 def full_race_lap_data_to_sql(context: AssetExecutionContext,
                               clean_full_race_lap_data: pd.DataFrame):
     df = clean_full_race_lap_data
@@ -0,0 +1,27 @@
+import datetime
+from dagster import asset, Output, AssetExecutionContext
+
+
+@asset(required_resource_keys={"fastf1"},
+       config_schema={'round_number': int,
+                      'year': int,
+                      'session': str})
+def warm_fastf1_cache(context: AssetExecutionContext):
+    round_number = context.op_config['round_number']
+    year = context.op_config['year']
+    session = context.op_config['session']
+
+    context.log.info(f"Warming the FastF1 cache ahead of {session} for round {round_number} - {year}")
+
+    warmed = context.resources.fastf1.warm_cache(year=year,
+                                                 round_number=round_number,
+                                                 session=session)
+
+    context.log.info(f"Cached: {', '.join(warmed)}")
+
+    return Output(value=warmed,
+                  metadata={
+                      'Cached': ', '.join(warmed),
+                      'Items': len(warmed),
+                      'Load Time': str(datetime.datetime.now())}
+                  )
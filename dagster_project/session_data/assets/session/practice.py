@@ -1,13 +1,21 @@
 import pandas as pd
 import datetime
-from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from dagster import asset, multi_asset, AssetOut, Output, MetadataValue, AssetExecutionContext
 from utils.discord_utils import DiscordUtils
-
-
-@asset(required_resource_keys={"fastf1"},
-       config_schema={'practice_num': int,
-                      'round_number': int,
-                      'year': int})
+from utils.lap_utils import LapUtils
+from utils.weather_utils import WeatherUtils
+from resources.fast_f1_resource import session_identifier
+from resources.sql_io_manager import SQLChunks
+
+
+@multi_asset(outs={'get_practice_data_api': AssetOut(),
+                   'practice_weather_to_sql': AssetOut(key_prefix=['WEATHER', 'SESSION_WEATHER', 'append'],
+                                                       io_manager_key='sql_io_manager',
+                                                       metadata={'write_strategy': 'bulk'})},
+             required_resource_keys={"fastf1"},
+             config_schema={'practice_num': int,
+                            'round_number': int,
+                            'year': int})
 def get_practice_data_api(context: AssetExecutionContext):
     practice_num = context.op_config['practice_num']
     round_number = context.op_config['round_number']
@@ -23,15 +31,37 @@ def get_practice_data_api(context: AssetExecutionContext):
     api_data = context.resources.fastf1.get_practice_results(year=year,
                                                              round_number=round_number,
                                                              practice_num=practice_num,
-                                                             drivers=False).copy()
+                                                             drivers=False,
+                                                             profile='laps+weather').copy()
 
     api_data.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
 
-    return Output(value=api_data,
-                  metadata={
-                      'Markdown': MetadataValue.md(api_data.head().to_markdown()),
-                      'Rows': len(api_data)}
-                  )
+    yield Output(value=api_data,
+                 output_name='get_practice_data_api',
+                 metadata={
+                     'Markdown': MetadataValue.md(api_data.head().to_markdown()),
+                     'Rows': len(api_data),
+                     'Session Cache': MetadataValue.json(context.resources.fastf1.session_cache_stats())}
+                 )
+
+    # The weather is read from the same laps+weather load as the results rather than a second Session.load
+    session_cd = practice_num
+    api_weather = context.resources.fastf1.get_session_weather(year=year,
+                                                               round_number=round_number,
+                                                               identifier=session_identifier(year, session_cd))
+    weather = WeatherUtils.clean_session_weather(api_weather, year=year, round_number=round_number,
+                                                 session_cd=session_cd)
+
+    context.log.info(f"Loading {len(weather)} rows of data into WEATHER.SESSION_WEATHER")
+
+    # Written in place of any weather already loaded for the session, so a re-run does not duplicate it
+    event_cd = int(str(year) + str(round_number))
+    yield Output(value=SQLChunks([weather], replace_where={'EVENT_CD': event_cd, 'SESSION_CD': session_cd}),
+                 output_name='practice_weather_to_sql',
+                 metadata={
+                     'Markdown': MetadataValue.md(weather.head().to_markdown()),
+                     'Rows': len(weather)}
+                 )
 
 
 @asset()
@@ -80,7 +110,8 @@ def clean_practice_data(context: AssetExecutionContext,
 
 
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['SESSION', 'PRACTICE_RESULTS', 'append'])
+       key_prefix=['SESSION', 'PRACTICE_RESULTS', 'merge'],
+       metadata={'merge_key': ['EVENT_CD', 'SESSION_CD', 'DRIVER_ID']})
 def practice_data_to_sql(context: AssetExecutionContext,
                          clean_practice_data: pd.DataFrame):
     df = clean_practice_data
@@ -99,3 +130,44 @@ def practice_data_to_sql(context: AssetExecutionContext,
                       'Rows': len(df),
                       'Load Time': str(datetime.datetime.now())}
                   )
+
+
+@asset(required_resource_keys={"fastf1"},
+       io_manager_key='sql_io_manager',
+       key_prefix=['SESSION', 'PRACTICE_LAPS', 'append'],
+       config_schema={'practice_num': int,
+                      'round_number': int,
+                      'year': int})
+def practice_lap_data_to_sql(context: AssetExecutionContext,
+                             get_drivers_sql: pd.DataFrame,
+                             get_teams_sql: pd.DataFrame):
+    session_cd = context.op_config['practice_num']
+    round_number = context.op_config['round_number']
+    year = context.op_config['year']
+    identifier = session_identifier(year, session_cd)
+    event_cd = int(str(year) + str(round_number))
+
+    mess = f"Loading {identifier} laps for round {round_number} - {year} into SESSION.PRACTICE_LAPS"
+
+    context.log.info(mess)
+
+    dis = DiscordUtils()
+    dis.send_message(message=mess)
+
+    # Laps are cleaned and written one driver at a time, replacing any rows already loaded for the session
+    def chunks():
+        for df in context.resources.fastf1.iter_session_laps(year=year,
+                                                             round_number=round_number,
+                                                             identifier=identifier,
+                                                             profile='laps+weather'):
+            df = LapUtils.clean_laps(df=df.assign(SESSION_CD=session_cd, EVENT_CD=event_cd),
+                                     driver_df=get_drivers_sql,
+                                     team_df=get_teams_sql)
+            df['LOAD_TS'] = datetime.datetime.now()
+            yield df
+
+    return Output(value=SQLChunks(chunks(), replace_where={'EVENT_CD': event_cd, 'SESSION_CD': session_cd}),
+                  metadata={
+                      'Session': identifier,
+                      'Load Time': str(datetime.datetime.now())}
+                  )
@@ -1,13 +1,21 @@
 import pandas as pd
 import datetime
-from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from dagster import asset, multi_asset, AssetOut, Output, MetadataValue, AssetExecutionContext
 from utils.discord_utils import DiscordUtils
-
-
-@asset(required_resource_keys={"fastf1"},
-       config_schema={'round_number': int,
-                      'year': int,
-                      'sprint': bool})
+from utils.lap_utils import LapUtils
+from utils.weather_utils import WeatherUtils
+from resources.fast_f1_resource import session_identifier
+from resources.sql_io_manager import SQLChunks
+
+
+@multi_asset(outs={'get_quali_data_api': AssetOut(),
+                   'quali_weather_to_sql': AssetOut(key_prefix=['WEATHER', 'SESSION_WEATHER', 'append'],
+                                                    io_manager_key='sql_io_manager',
+                                                    metadata={'write_strategy': 'bulk'})},
+             required_resource_keys={"fastf1"},
+             config_schema={'round_number': int,
+                            'year': int,
+                            'sprint': bool})
 def get_quali_data_api(context: AssetExecutionContext):
     sprint = context.op_config['sprint']
     round_number = context.op_config['round_number']
@@ -23,7 +31,8 @@ def get_quali_data_api(context: AssetExecutionContext):
 
         api_data = context.resources.fastf1.get_qualifying_results(year=year,
                                                                    round_number=round_number,
-                                                                   sprint=True).copy()
+                                                                   sprint=True,
+                                                                   profile='laps+weather').copy()
 
         api_data.loc[:, 'SESSION_CD'] = 5
         api_data.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
@@ -36,16 +45,38 @@ def get_quali_data_api(context: AssetExecutionContext):
         dis.send_message(message=mess)
 
         api_data = context.resources.fastf1.get_qualifying_results(year=year,
-                                                                   round_number=round_number).copy()
+                                                                   round_number=round_number,
+                                                                   profile='laps+weather').copy()
 
         api_data.loc[:, 'SESSION_CD'] = 4
         api_data.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
 
-    return Output(value=api_data,
-                  metadata={
-                      'Markdown': MetadataValue.md(api_data.head().to_markdown()),
-                      'Rows': len(api_data)}
-                  )
+    yield Output(value=api_data,
+                 output_name='get_quali_data_api',
+                 metadata={
+                     'Markdown': MetadataValue.md(api_data.head().to_markdown()),
+                     'Rows': len(api_data),
+                     'Session Cache': MetadataValue.json(context.resources.fastf1.session_cache_stats())}
+                 )
+
+    # The weather is read from the same laps+weather load as the results rather than a second Session.load
+    session_cd = 5 if sprint else 4
+    api_weather = context.resources.fastf1.get_session_weather(year=year,
+                                                               round_number=round_number,
+                                                               identifier=session_identifier(year, session_cd))
+    weather = WeatherUtils.clean_session_weather(api_weather, year=year, round_number=round_number,
+                                                 session_cd=session_cd)
+
+    context.log.info(f"Loading {len(weather)} rows of data into WEATHER.SESSION_WEATHER")
+
+    # Written in place of any weather already loaded for the session, so a re-run does not duplicate it
+    event_cd = int(str(year) + str(round_number))
+    yield Output(value=SQLChunks([weather], replace_where={'EVENT_CD': event_cd, 'SESSION_CD': session_cd}),
+                 output_name='quali_weather_to_sql',
+                 metadata={
+                     'Markdown': MetadataValue.md(weather.head().to_markdown()),
+                     'Rows': len(weather)}
+                 )
 
 
 @asset()
@@ -125,3 +156,44 @@ def quali_data_to_sql(context: AssetExecutionContext,
                       'Rows': len(df),
                       'Load Time': str(datetime.datetime.now())}
                   )
+
+
+@asset(required_resource_keys={"fastf1"},
+       io_manager_key='sql_io_manager',
+       key_prefix=['SESSION', 'QUALIFYING_LAPS', 'append'],
+       config_schema={'round_number': int,
+                      'year': int,
+                      'sprint': bool})
+def quali_lap_data_to_sql(context: AssetExecutionContext,
+                          get_drivers_sql: pd.DataFrame,
+                          get_teams_sql: pd.DataFrame):
+    round_number = context.op_config['round_number']
+    year = context.op_config['year']
+    session_cd = 5 if context.op_config['sprint'] else 4
+    identifier = session_identifier(year, session_cd)
+    event_cd = int(str(year) + str(round_number))
+
+    mess = f"Loading {identifier} laps for round {round_number} - {year} into SESSION.QUALIFYING_LAPS"
+
+    context.log.info(mess)
+
+    dis = DiscordUtils()
+    dis.send_message(message=mess)
+
+    # Laps are cleaned and written one driver at a time, replacing any rows already loaded for the session
+    def chunks():
+        for df in context.resources.fastf1.iter_session_laps(year=year,
+                                                             round_number=round_number,
+                                                             identifier=identifier,
+                                                             profile='laps+weather'):
+            df = LapUtils.clean_laps(df=df.assign(SESSION_CD=session_cd, EVENT_CD=event_cd),
+                                     driver_df=get_drivers_sql,
+                                     team_df=get_teams_sql)
+            df['LOAD_TS'] = datetime.datetime.now()
+            yield df
+
+    return Output(value=SQLChunks(chunks(), replace_where={'EVENT_CD': event_cd, 'SESSION_CD': session_cd}),
+                  metadata={
+                      'Session': identifier,
+                      'Load Time': str(datetime.datetime.now())}
+                  )
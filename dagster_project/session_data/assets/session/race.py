@@ -1,13 +1,21 @@
 import pandas as pd
 import numpy as np
 import datetime
-from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from dagster import asset, multi_asset, AssetOut, Output, MetadataValue, AssetExecutionContext
 from utils.discord_utils import DiscordUtils
-
-@asset(required_resource_keys={"fastf1"},
-       config_schema={'round_number': int,
-                      'year': int,
-                      'sprint': bool})
+from utils.lap_utils import LapUtils
+from utils.weather_utils import WeatherUtils
+from resources.fast_f1_resource import session_identifier
+from resources.sql_io_manager import SQLChunks
+
+@multi_asset(outs={'get_race_data_api': AssetOut(),
+                   'race_weather_to_sql': AssetOut(key_prefix=['WEATHER', 'SESSION_WEATHER', 'append'],
+                                                   io_manager_key='sql_io_manager',
+                                                   metadata={'write_strategy': 'bulk'})},
+             required_resource_keys={"fastf1"},
+             config_schema={'round_number': int,
+                            'year': int,
+                            'sprint': bool})
 def get_race_data_api(context: AssetExecutionContext):
     sprint = context.op_config['sprint']
     round_number = context.op_config['round_number']
@@ -23,7 +31,8 @@ def get_race_data_api(context: AssetExecutionContext):
 
         api_data = context.resources.fastf1.get_race_results(year=year,
                                                              round_number=round_number,
-                                                             sprint=True).copy()
+                                                             sprint=True,
+                                                             profile='laps+weather').copy()
 
         api_data.loc[:, 'SESSION_CD'] = 6
         api_data.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
@@ -36,16 +45,38 @@ def get_race_data_api(context: AssetExecutionContext):
         dis.send_message(message=mess)
 
         api_data = context.resources.fastf1.get_race_results(year=year,
-                                                             round_number=round_number).copy()
+                                                             round_number=round_number,
+                                                             profile='laps+weather').copy()
 
         api_data.loc[:, 'SESSION_CD'] = 7
         api_data.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
 
-    return Output(value=api_data,
-                  metadata={
-                      'Markdown': MetadataValue.md(api_data.head().to_markdown()),
-                      'Rows': len(api_data)}
-                  )
+    yield Output(value=api_data,
+                 output_name='get_race_data_api',
+                 metadata={
+                     'Markdown': MetadataValue.md(api_data.head().to_markdown()),
+                     'Rows': len(api_data),
+                     'Session Cache': MetadataValue.json(context.resources.fastf1.session_cache_stats())}
+                 )
+
+    # The weather is read from the same laps+weather load as the results rather than a second Session.load
+    session_cd = 6 if sprint else 7
+    api_weather = context.resources.fastf1.get_session_weather(year=year,
+                                                               round_number=round_number,
+                                                               identifier=session_identifier(year, session_cd))
+    weather = WeatherUtils.clean_session_weather(api_weather, year=year, round_number=round_number,
+                                                 session_cd=session_cd)
+
+    context.log.info(f"Loading {len(weather)} rows of data into WEATHER.SESSION_WEATHER")
+
+    # Written in place of any weather already loaded for the session, so a re-run does not duplicate it
+    event_cd = int(str(year) + str(round_number))
+    yield Output(value=SQLChunks([weather], replace_where={'EVENT_CD': event_cd, 'SESSION_CD': session_cd}),
+                 output_name='race_weather_to_sql',
+                 metadata={
+                     'Markdown': MetadataValue.md(weather.head().to_markdown()),
+                     'Rows': len(weather)}
+                 )
 
 
 @asset()
@@ -138,6 +169,7 @@ def get_race_lap_data_api(context: AssetExecutionContext):
                   metadata={
                       'Markdown': MetadataValue.md(df.head().to_markdown()),
                       'Rows': len(df),
+                      'Session Cache': MetadataValue.json(context.resources.fastf1.session_cache_stats()),
                       'Load Time': str(datetime.datetime.now())}
                   )
 
@@ -147,77 +179,10 @@ def clean_race_lap_data(context: AssetExecutionContext,
                         get_race_lap_data_api: pd.DataFrame,
                         get_drivers_sql: pd.DataFrame,
                         get_teams_sql: pd.DataFrame):
-    df = get_race_lap_data_api
-    driver_df = get_drivers_sql
-    team_df = get_teams_sql
-    # Merging Team and Driver dfs with data df
-    context.log.info('Merging race lap data with driver and team data')
-    df = pd.merge(df, driver_df, how='left', left_on='Driver', right_on='DRIVER_CODE')
-    df = pd.merge(df, team_df, how='left', left_on='Team', right_on='NAME')
-
-    context.log.info('Creating Pit In/Out Columns')
-    df.loc[~df['PitInTime'].isna(), 'PIT_IN_FLG'] = 1
-    df.loc[df['PitInTime'].isna(), 'PIT_IN_FLG'] = 0
-    df.loc[~df['PitOutTime'].isna(), 'PIT_OUT_FLG'] = 1
-    df.loc[df['PitOutTime'].isna(), 'PIT_OUT_FLG'] = 0
-
-    context.log.info('Setting LapTime columns to seconds.')
-    df["LapTime"] = df["LapTime"].dt.total_seconds()
-    df["Sector1Time"] = df["Sector1Time"].dt.total_seconds()
-    df["Sector2Time"] = df["Sector2Time"].dt.total_seconds()
-    df["Sector3Time"] = df["Sector3Time"].dt.total_seconds()
-
-    context.log.info('Setting bool columns to 1 and 0.')
-    df["Deleted"] = df["Deleted"].astype(int)
-    df["IsAccurate"] = df["IsAccurate"].astype(int)
-
-    context.log.info('Setting blanks in track status to -2')
-    df["TrackStatus"] = df["TrackStatus"].replace('', -2)
-
-    context.log.info('Removing unused columns')
-    df.drop(columns=['Driver',
-                     'Team',
-                     'DRIVER_CODE',
-                     'NAME',
-                     'QUALI_CD',
-                     'DRIVER_NUMBER',
-                     'PitInTime',
-                     'PitOutTime',
-                     'Time',
-                     'DriverNumber',
-                     'Sector1SessionTime',
-                     'Sector2SessionTime',
-                     'Sector3SessionTime',
-                     'IsPersonalBest',
-                     'FreshTyre',
-                     'LapStartTime',
-                     'FastF1Generated'], inplace=True)
-
-    context.log.info('Renaming columns')
-    df.rename(columns={'LapNumber': 'LAP_NUMBER',
-                       'CONSTRUCTOR_ID': 'TEAM_ID',
-                       'Stint': 'STINT_NUMBER',
-                       'LapTime': 'LAPTIME',
-                       'Sector1Time': 'SECTOR1_TIME',
-                       'Sector2Time': 'SECTOR2_TIME',
-                       'Sector3Time': 'SECTOR3_TIME',
-                       'SpeedI1': 'SPEED_TRAP_1',
-                       'SpeedI2': 'SPEED_TRAP_2',
-                       'SpeedFL': 'SPEED_TRAP_FLAG',
-                       'SpeedST': 'SPEED_TRAP_STRAIGHT',
-                       'Compound': 'COMPOUND',
-                       'TyreLife': 'TYRE_LIFE',
-                       'LapStartDate': 'LAP_START_DATETIME',
-                       'TrackStatus': 'TRACK_STATUS',
-                       'Position': 'POSITION',
-                       'Deleted': 'LAP_DELETED',
-                       'DeletedReason': 'LAP_DELETED_REASON',
-                       'IsAccurate': 'FF1_LAP_IS_ACCURATE'},
-              inplace=True)
-
-    context.log.info('Removing rows where laptime is null')
-    df.dropna(subset=['LAPTIME'],
-              inplace=True)
+    context.log.info('Merging race lap data with driver and team data and renaming columns')
+    df = LapUtils.clean_laps(df=get_race_lap_data_api,
+                             driver_df=get_drivers_sql,
+                             team_df=get_teams_sql)
 
     return Output(value=df,
                   metadata={
@@ -228,7 +193,8 @@ def clean_race_lap_data(context: AssetExecutionContext,
 
 
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['SESSION', 'RACE_LAPS', 'append'])
+       key_prefix=['SESSION', 'RACE_LAPS', 'merge'],
+       metadata={'merge_key': ['EVENT_CD', 'SESSION_CD', 'DRIVER_ID', 'LAP_NUMBER']})
 def race_lap_data_to_sql(context: AssetExecutionContext,
                          clean_race_lap_data: pd.DataFrame):
     df = clean_race_lap_data
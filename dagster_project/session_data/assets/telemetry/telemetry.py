@@ -0,0 +1,69 @@
+import os
+import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dagster import asset, Output, AssetExecutionContext
+from utils.discord_utils import DiscordUtils
+
+data_loc = os.getenv('DATA_STORE_LOC')
+
+
+@asset(required_resource_keys={"fastf1"},
+       config_schema={'round_number': int,
+                      'year': int,
+                      'session': str,
+                      'grid': str,
+                      'step': float})
+def session_telemetry_to_parquet(context: AssetExecutionContext):
+    round_number = context.op_config['round_number']
+    year = context.op_config['year']
+    session = context.op_config['session']
+    grid = context.op_config['grid']
+    step = context.op_config['step']
+
+    if grid not in ['distance', 'time']:
+        raise Exception(f'Invalid telemetry grid {grid}, expected distance or time')
+
+    mess = f"Getting {session} telemetry for round {round_number} - {year}"
+
+    context.log.info(mess)
+
+    dis = DiscordUtils()
+    dis.send_message(message=mess)
+
+    file_loc = os.path.join(data_loc, 'telemetry', f'year={year}', f'round={round_number}', f'session={session}')
+    os.makedirs(file_loc, exist_ok=True)
+    file_path = os.path.join(file_loc, 'telemetry.parquet')
+
+    # Each driver lap is written as its own row group so the downsampled output is never accumulated, the raw
+    # telemetry of the whole session is still held while it is processed (see FastF1Client.iter_lap_telemetry)
+    writer = None
+    rows = 0
+    laps = 0
+    try:
+        for chunk in context.resources.fastf1.iter_lap_telemetry(year=year,
+                                                                 round_number=round_number,
+                                                                 identifier=session,
+                                                                 grid=grid,
+                                                                 step=step):
+            chunk.loc[:, 'EVENT_CD'] = int(str(year) + str(round_number))
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file_path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+            laps += 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+    context.log.info(f'Written {rows} rows of telemetry for {laps} laps to {file_path}')
+
+    return Output(value=file_path,
+                  metadata={
+                      'File': file_path,
+                      'Laps': laps,
+                      'Rows': rows,
+                      'Size (MB)': round(os.path.getsize(file_path) / 1024 ** 2, 2) if laps else 0,
+                      'Load Time': str(datetime.datetime.now())}
+                  )
@@ -8,9 +8,11 @@ from .assets.full_session.practice import *
 from .assets.full_session.qualifying import *
 from .assets.full_session.race import *
 from .assets.pre_assets.pre_assets import *
+from .assets.pre_assets.cache_warmup import *
 from .assets.session.practice import *
 from .assets.session.qualifying import *
 from .assets.session.race import *
+from .assets.telemetry.telemetry import *
 from datetime import datetime
 
 first_year = 2018
@@ -32,6 +34,8 @@ full_session_data_load_job = define_asset_job('full_session_data_load_job',
                                                                               get_full_race_lap_data_api,
                                                                               clean_full_race_lap_data,
                                                                               full_race_lap_data_to_sql,
+                                                                              full_practice_lap_data_to_sql,
+                                                                              full_quali_lap_data_to_sql,
                                                                               get_drivers_sql,
                                                                               get_teams_sql),
                                               description="Job to load all session data for a list of years "
@@ -103,16 +107,53 @@ full_race_laps_data_load_job = define_asset_job('full_race_laps_data_load_job',
                                                                        }}}}
                                                 )
 
+full_practice_laps_data_load_job = define_asset_job('full_practice_laps_data_load_job',
+                                                    selection=AssetSelection.assets(get_events_sql,
+                                                                                    get_drivers_sql,
+                                                                                    get_teams_sql,
+                                                                                    full_practice_lap_data_to_sql),
+                                                    description="Job to load the Practice Laps for a list of years "
+                                                                "(2018+) and upload the data to MySQL",
+                                                    op_retry_policy=RetryPolicy(max_retries=3),
+                                                    config={'ops':
+                                                                {'get_events_sql':
+                                                                     {"config":
+                                                                          {'year_list': year_list
+                                                                           }}}}
+                                                    )
+
+full_qualifying_laps_data_load_job = define_asset_job('full_qualifying_laps_data_load_job',
+                                                      selection=AssetSelection.assets(get_events_sql,
+                                                                                      get_drivers_sql,
+                                                                                      get_teams_sql,
+                                                                                      full_quali_lap_data_to_sql),
+                                                      description="Job to load the Qualifying Laps for a list of "
+                                                                  "years (2018+) and upload the data to MySQL",
+                                                      op_retry_policy=RetryPolicy(max_retries=3),
+                                                      config={'ops':
+                                                                  {'get_events_sql':
+                                                                       {"config":
+                                                                            {'year_list': year_list
+                                                                             }}}}
+                                                      )
+
 # Single Session Load Jobs
 practice_data_load_job = define_asset_job('practice_data_load_job',
                                           selection=AssetSelection.assets(get_drivers_sql,
                                                                           get_teams_sql,
                                                                           get_practice_data_api,
                                                                           clean_practice_data,
-                                                                          practice_data_to_sql),
+                                                                          practice_data_to_sql,
+                                                                          practice_lap_data_to_sql),
                                           description="Job to load the practice session for the config provided.",
                                           config={'ops':
                                                       {'get_practice_data_api':
+                                                           {"config":
+                                                                {'practice_num': 1,
+                                                                 'round_number': 1,
+                                                                 'year': 2025
+                                                                 }},
+                                                       'practice_lap_data_to_sql':
                                                            {"config":
                                                                 {'practice_num': 1,
                                                                  'round_number': 1,
@@ -125,10 +166,17 @@ quali_data_load_job = define_asset_job('qualifying_data_load_job',
                                                                        get_teams_sql,
                                                                        get_quali_data_api,
                                                                        clean_quali_data,
-                                                                       quali_data_to_sql),
+                                                                       quali_data_to_sql,
+                                                                       quali_lap_data_to_sql),
                                        description="Job to load the Qualifying session for the config provided.",
                                        config={'ops':
                                                    {'get_quali_data_api':
+                                                        {"config":
+                                                             {'sprint': False,
+                                                              'round_number': 1,
+                                                              'year': 2025
+                                                              }},
+                                                    'quali_lap_data_to_sql':
                                                         {"config":
                                                              {'sprint': False,
                                                               'round_number': 1,
@@ -165,3 +213,33 @@ race_laps_data_load_job = define_asset_job('race_laps_data_load_job',
                                                                   'year': 2025
                                                                   }}}}
                                            )
+
+# Telemetry Jobs
+session_telemetry_load_job = define_asset_job('session_telemetry_load_job',
+                                              selection=AssetSelection.assets(session_telemetry_to_parquet),
+                                              description="Job to stream the downsampled car telemetry for the "
+                                                          "session in the config provided to Parquet.",
+                                              config={'ops':
+                                                          {'session_telemetry_to_parquet':
+                                                               {"config":
+                                                                    {'round_number': 1,
+                                                                     'year': 2025,
+                                                                     'session': 'Race',
+                                                                     'grid': 'distance',
+                                                                     'step': 10.0
+                                                                     }}}}
+                                              )
+
+# Cache Jobs
+fastf1_cache_warmup_job = define_asset_job('fastf1_cache_warmup_job',
+                                           selection=AssetSelection.assets(warm_fastf1_cache),
+                                           description="Job to pre-fetch the FastF1 data for the weekend ahead of "
+                                                       "the session in the config provided.",
+                                           config={'ops':
+                                                       {'warm_fastf1_cache':
+                                                            {"config":
+                                                                 {'round_number': 1,
+                                                                  'year': 2025,
+                                                                  'session': 'Qualifying'
+                                                                  }}}}
+                                           )
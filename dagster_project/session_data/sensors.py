@@ -7,6 +7,7 @@ from dagster import (sensor,
                      SensorEvaluationContext)
 from utils.file_utils import FileUtils
 from fastf1.core import DataNotLoadedError
+from resources.rate_limit import RateLimitTimeout
 from datetime import datetime, timedelta, date
 from .jobs import *
 
@@ -67,18 +68,20 @@ def practice_data_load_sensor(context: SensorEvaluationContext):
 
     if session_time_modified < today:
         try:
-            api_data = context.resources.fastf1.get_practice_results(year=next_event_df['EVENT_YEAR'],
-                                                                     round_number=next_event_df['ROUND_NUMBER'],
-                                                                     practice_num=next_session['session_name'][-1],
-                                                                     drivers=False).copy()
+            probe = context.resources.fastf1.probe_session(year=next_event_df['EVENT_YEAR'],
+                                                           round_number=next_event_df['ROUND_NUMBER'],
+                                                           identifier=next_session['session_name'])
 
-            drivers = pd.unique(api_data['Driver'])
-            if len(drivers) <= 1:
+            if probe.drivers <= 1:
                 return SkipReason("Session data is not available as there is no drivers in the data")
+            if not probe.laps:
+                return SkipReason("Session data is not available as there is no lap times in the data")
         except KeyError:
             return SkipReason("Session data is not available (KeyError)")
         except DataNotLoadedError:
             return SkipReason("Session data is not available (DataNotLoadedError)")
+        except RateLimitTimeout:
+            return SkipReason("The FastF1 probe budget is spent, checking again next tick")
 
         context.update_cursor(f'{next_event_df["ROUND_NUMBER"]} - {next_session["session_name"]}')
         return RunRequest(
@@ -86,7 +89,11 @@ def practice_data_load_sensor(context: SensorEvaluationContext):
                 'ops': {'get_practice_data_api': {"config": {'practice_num': int(next_session['session_name'][-1]),
                                                              'round_number': int(next_event_df['ROUND_NUMBER']),
                                                              'year': int(next_event_df['EVENT_YEAR'])
-                                                             }}}}
+                                                             }},
+                        'practice_lap_data_to_sql': {"config": {'practice_num': int(next_session['session_name'][-1]),
+                                                                'round_number': int(next_event_df['ROUND_NUMBER']),
+                                                                'year': int(next_event_df['EVENT_YEAR'])
+                                                                }}}}
         )
     else:
         return SkipReason(f"It is not 30 mins after the {next_session['session_name']}, next session is on "
@@ -155,26 +162,32 @@ def qualifying_data_load_sensor(context: SensorEvaluationContext):
             else:
                 sprint = False
 
-            api_data = context.resources.fastf1.get_qualifying_results(year=next_event_df['EVENT_YEAR'],
-                                                                       round_number=next_event_df['ROUND_NUMBER'],
-                                                                       sprint=sprint).copy()
+            probe = context.resources.fastf1.probe_session(year=next_event_df['EVENT_YEAR'],
+                                                           round_number=next_event_df['ROUND_NUMBER'],
+                                                           identifier=session_name)
 
-            drivers = pd.unique(api_data['Abbreviation'])
-            if len(drivers) <= 1:
+            if probe.drivers <= 1:
                 return SkipReason("Session data is not available as there is no drivers in the data")
-            if len(api_data[~api_data['Q1'].isnull()]) == 0:
+            # Stints are only published once cars have set laps, the full load is left to the run
+            if not probe.laps:
                 return SkipReason("Session data is not available as there is no lap times in the data")
         except KeyError:
             return SkipReason("Session data is not available (KeyError)")
         except DataNotLoadedError:
             return SkipReason("Session data is not available (DataNotLoadedError)")
+        except RateLimitTimeout:
+            return SkipReason("The FastF1 probe budget is spent, checking again next tick")
 
         context.update_cursor(f'{next_event_df["ROUND_NUMBER"]} - {next_session["session_name"]}')
         return RunRequest(
             run_config={'ops': {'get_quali_data_api': {"config": {'round_number': int(next_event_df['ROUND_NUMBER']),
                                                                   'year': int(next_event_df['EVENT_YEAR']),
                                                                   'sprint': sprint
-                                                                  }}}}
+                                                                  }},
+                                'quali_lap_data_to_sql': {"config": {'round_number': int(next_event_df['ROUND_NUMBER']),
+                                                                     'year': int(next_event_df['EVENT_YEAR']),
+                                                                     'sprint': sprint
+                                                                     }}}}
         )
     else:
         return SkipReason(f"It is not 30 mins after the {next_session['session_name']}, next session is on "
@@ -243,17 +256,18 @@ def race_data_load_sensor(context: SensorEvaluationContext):
             else:
                 sprint = False
 
-            api_data = context.resources.fastf1.get_race_results(year=int(next_event_df['EVENT_YEAR']),
-                                                                 round_number=int(next_event_df['ROUND_NUMBER']),
-                                                                 sprint=sprint).copy()
+            probe = context.resources.fastf1.probe_session(year=int(next_event_df['EVENT_YEAR']),
+                                                           round_number=int(next_event_df['ROUND_NUMBER']),
+                                                           identifier=session_name)
 
-            drivers = pd.unique(api_data['DriverId'])
-            if len(drivers) <= 1:
+            if probe.drivers <= 1:
                 return SkipReason("Session data is not available as there is no drivers in the data")
         except KeyError:
             return SkipReason("Session data is not available (KeyError)")
         except DataNotLoadedError:
             return SkipReason("Session data is not available (DataNotLoadedError)")
+        except RateLimitTimeout:
+            return SkipReason("The FastF1 probe budget is spent, checking again next tick")
 
         context.update_cursor(f'{next_event_df["ROUND_NUMBER"]} - {next_session["session_name"]}')
         return RunRequest(
@@ -329,18 +343,18 @@ def race_laps_data_load_sensor(context: SensorEvaluationContext):
             else:
                 sprint = False
 
-            api_data = context.resources.fastf1.get_race_results(year=int(next_event_df['EVENT_YEAR']),
-                                                                 round_number=int(next_event_df['ROUND_NUMBER']),
-                                                                 sprint=sprint,
-                                                                 laps=True).copy()
+            probe = context.resources.fastf1.probe_session(year=int(next_event_df['EVENT_YEAR']),
+                                                           round_number=int(next_event_df['ROUND_NUMBER']),
+                                                           identifier=session_name)
 
-            drivers = pd.unique(api_data['Driver'])
-            if len(drivers) == 0:
+            if probe.drivers == 0 or not probe.laps:
                 return SkipReason("Session data is not available")
         except KeyError:
             return SkipReason("Session data is not available (KeyError)")
         except DataNotLoadedError:
             return SkipReason("Session data is not available (DataNotLoadedError)")
+        except RateLimitTimeout:
+            return SkipReason("The FastF1 probe budget is spent, checking again next tick")
 
         context.update_cursor(f'{next_event_df["ROUND_NUMBER"]} - {next_session["session_name"]}')
         return RunRequest(
@@ -352,3 +366,36 @@ def race_laps_data_load_sensor(context: SensorEvaluationContext):
     else:
         return SkipReason(f"It is not 30 mins after the {next_session['session_name']}, next session is on "
                           f"{session_time.date()} at {session_time.time()}")
+
+
+@sensor(job=fastf1_cache_warmup_job,
+        minimum_interval_seconds=900,
+        required_resource_keys={'mysql'})
+def fastf1_cache_warmup_sensor(context: SensorEvaluationContext):
+    today = datetime.utcnow()
+
+    calender_query = FileUtils.file_to_query('sql_next_event')
+    with context.resources.mysql.get_connection() as conn:
+        next_event_df = pd.read_sql(calender_query, conn)
+
+    if next_event_df.empty:
+        return SkipReason('No next event data available')
+    next_event_df = next_event_df.iloc[0]
+
+    # Warm the cache in the two hours before each session so the post session load only fetches new timing data
+    run_requests = list()
+    for session in ['SESSION_ONE', 'SESSION_TWO', 'SESSION_THREE', 'SESSION_FOUR', 'SESSION_FIVE']:
+        session_time = next_event_df[f'{session}_DT']
+        session_name = next_event_df[f'{session}_TYPE']
+        if session_time - timedelta(hours=2) <= today < session_time:
+            run_requests.append(RunRequest(
+                run_key=f'{next_event_df["EVENT_CD"]} - {session_name}',
+                run_config={'ops': {'warm_fastf1_cache': {"config": {'round_number': int(next_event_df['ROUND_NUMBER']),
+                                                                     'year': int(next_event_df['EVENT_YEAR']),
+                                                                     'session': session_name
+                                                                     }}}}
+            ))
+
+    if len(run_requests) == 0:
+        return SkipReason(f"No {next_event_df['EVENT_NAME']} session starts in the next two hours")
+    return run_requests
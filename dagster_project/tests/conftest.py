@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The code locations import each other as top level packages (resources, utils, ...) from dagster_project
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('filelock')
+pytest.importorskip('zstandard')
+
+import os
+import random
+import time
+from resources.fast_f1_cache_store import PackedCacheStore
+
+SESSIONS = 6
+TIMING_LINES = 20000
+
+
+def write_session(cache_loc: str, number: int) -> str:
+    # Lays out a session folder like FastF1's api cache, a large timing text stream per session plus a driver
+    # list that is the same for every session of the weekend
+    session_dir = os.path.join(cache_loc, '2024', '2024-03-02_Bahrain_Grand_Prix', f'2024-02-29_Session_{number}')
+    os.makedirs(session_dir)
+    rng = random.Random(number)
+    with open(os.path.join(session_dir, 'timing_data.ff1pkl'), 'w') as file:
+        for line in range(TIMING_LINES):
+            file.write(f'00:{line // 600:02d}:{line % 60:02d}.{rng.randint(0, 999):03d}'
+                       f'{{"Lines":{{"{rng.randint(1, 20)}":{{"Sectors":{{"{rng.randint(0, 2)}":'
+                       f'{{"Value":"{rng.uniform(25, 40):.3f}"}}}}}}}}}}\n')
+    with open(os.path.join(session_dir, 'driver_info.ff1pkl'), 'w') as file:
+        file.write(''.join(f'{{"RacingNumber":"{driver}","Tla":"D{driver:0>2}"}}\n' for driver in range(1, 21)) * 50)
+    return session_dir
+
+
+def read_session(session_dir: str) -> dict:
+    payloads = dict()
+    for name in sorted(os.listdir(session_dir)):
+        with open(os.path.join(session_dir, name), 'rb') as file:
+            payloads[name] = file.read()
+    return payloads
+
+
+def test_packed_cache_benchmark(tmp_path):
+    cache_loc = str(tmp_path)
+    store = PackedCacheStore(cache_loc)
+    session_dirs = [write_session(cache_loc, number) for number in range(SESSIONS)]
+
+    stock_bytes = sum(os.path.getsize(os.path.join(session_dir, name))
+                      for session_dir in session_dirs for name in os.listdir(session_dir))
+
+    start = time.perf_counter()
+    stock_payloads = [read_session(session_dir) for session_dir in session_dirs]
+    stock_s = time.perf_counter() - start
+
+    for session_dir in session_dirs:
+        store.pack(session_dir)
+    footprint = store.footprint()
+
+    # A packed session is rehydrated by FastF1Client._load before FastF1 reads it from disk
+    start = time.perf_counter()
+    for session_dir in session_dirs:
+        assert store.unpack(session_dir)
+    unpacked_payloads = [read_session(session_dir) for session_dir in session_dirs]
+    packed_s = time.perf_counter() - start
+
+    assert unpacked_payloads == stock_payloads
+    assert footprint['raw_bytes'] == stock_bytes
+    assert footprint['stored_bytes'] < footprint['deduplicated_bytes'] < footprint['raw_bytes']
+
+    print(f'\n{SESSIONS} sessions: stock cache {stock_bytes / 1024 ** 2:.1f}MB, deduplicated '
+          f'{footprint["deduplicated_bytes"] / 1024 ** 2:.1f}MB, packed {footprint["stored_bytes"] / 1024 ** 2:.2f}MB '
+          f'({footprint["compression_ratio"]}x), reading the stock folders {stock_s * 1000:.1f}ms, '
+          f'unpacking and reading {packed_s * 1000:.1f}ms')
@@ -0,0 +1,171 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('fastf1')
+pytest.importorskip('dagster')
+
+import os
+from fastf1.exceptions import DataNotLoadedError
+from resources import fast_f1_resource, fast_f1_replay
+from resources.fast_f1_resource import FastF1Client, RACE_LAP_COLUMNS, FASTEST_LAP_COLUMNS, WEATHER_COLUMNS
+from resources.rate_limit import RateLimitTimeout
+from resources.session_lake import SessionLake
+
+API_PATH = '/static/2024/2024-03-02_Bahrain_Grand_Prix/2024-02-29_Practice_1/'
+
+
+class NoLapsSession:
+    date = pd.NaT
+    drivers = ['1', '44']
+    results = pd.DataFrame({'DriverId': ['max_verstappen', 'hamilton'],
+                            'TeamId': ['red_bull', 'mercedes'],
+                            'Abbreviation': ['VER', 'HAM']})
+
+    @property
+    def laps(self):
+        raise DataNotLoadedError('The data you are trying to access has not been loaded yet.')
+
+    @property
+    def weather_data(self):
+        raise DataNotLoadedError('The data you are trying to access has not been loaded yet.')
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    client = FastF1Client(cache_loc=str(tmp_path))
+    monkeypatch.setattr(client, '_load_session', lambda **kwargs: NoLapsSession())
+    return client
+
+
+def test_session_without_laps_returns_empty_frames(client):
+    laps = client.get_session_laps(2024, 1, 'FP1')
+    assert laps.empty
+    assert list(laps.columns) == RACE_LAP_COLUMNS
+
+    weather = client.get_session_weather(2024, 1, 'FP1')
+    assert weather.empty
+    assert list(weather.columns) == WEATHER_COLUMNS
+
+
+def test_practice_results_without_laps(client):
+    df = client.get_practice_results(2024, 1, practice_num=1, drivers=False)
+    assert df.empty
+    assert list(df.columns) == FASTEST_LAP_COLUMNS + ['SESSION_CD']
+
+    df = client.get_practice_results(2024, 1, practice_num=1, drivers=True)
+    assert list(df.index) == ['VER', 'HAM']
+    assert df['LapTime'].isna().all()
+
+
+def test_fastest_laps_fallback_has_every_column():
+    assert list(FastF1Client._fastest_laps(NoLapsSession()).columns) == FASTEST_LAP_COLUMNS
+
+
+class CachedSession:
+    # Writes a payload into the session folder the way FastF1's api cache does
+    api_path = API_PATH
+
+    def __init__(self, cache_loc):
+        self.session_dir = os.path.join(cache_loc, '2024', '2024-03-02_Bahrain_Grand_Prix', '2024-02-29_Practice_1')
+
+    def load(self, **kwargs):
+        os.makedirs(self.session_dir, exist_ok=True)
+        with open(os.path.join(self.session_dir, 'timing_data.ff1pkl'), 'w') as file:
+            file.write('laps')
+
+
+class CountingRateLimit:
+    def __init__(self):
+        self.calls = list()
+
+    def acquire(self, cost, timeout=None):
+        self.calls.append(cost)
+        return 0.0
+
+
+def test_probe_then_laps_load_is_a_miss(tmp_path, monkeypatch):
+    session = CachedSession(str(tmp_path))
+
+    def driver_info(api_path):
+        # The probe's api calls are cached into the session folder too
+        os.makedirs(session.session_dir, exist_ok=True)
+        with open(os.path.join(session.session_dir, 'driver_info.ff1pkl'), 'w') as file:
+            file.write('drivers')
+        return {'1': {}, '44': {}}
+
+    monkeypatch.setattr(fast_f1_resource.ff1, 'get_session', lambda **kwargs: session)
+    monkeypatch.setattr(fast_f1_resource.ff1_api, 'driver_info', driver_info)
+    monkeypatch.setattr(fast_f1_resource.ff1_api, 'timing_app_data', lambda api_path: pd.DataFrame({'Stint': [1]}))
+    monkeypatch.setattr(fast_f1_resource.ff1_api, 'session_status_data', lambda api_path: {'Status': ['Started']})
+
+    rate_limit = CountingRateLimit()
+    client = FastF1Client(cache_loc=str(tmp_path), rate_limit=rate_limit)
+
+    assert client.probe_session(2024, 1, 'FP1').drivers == 2
+    assert os.path.isdir(session.session_dir)
+
+    client._load(session, 'laps')
+    assert client.cache_index.hit_ratio(reset=False) == 0.0
+    assert client.stats()['api_loads'] == 1
+    assert rate_limit.calls == [fast_f1_resource.LOAD_PROFILE_CALLS['laps']]
+
+    # The laps are on disk now, a lighter profile is served from them
+    client._load(session, 'results')
+    assert client.cache_index.hit_ratio(reset=False) == 0.5
+    assert client.stats()['disk_cache_loads'] == 1
+    assert len(rate_limit.calls) == 1
+
+
+def test_probes_do_not_spend_the_load_budget(tmp_path, monkeypatch):
+    probe = fast_f1_resource.SessionProbe(drivers=20, laps=True, timing_complete=True)
+    monkeypatch.setattr(FastF1Client, 'probe_session', staticmethod(lambda *args: probe))
+
+    resource = fast_f1_resource.FastF1Resource(cache_loc=str(tmp_path),
+                                               rate_limit_db=str(tmp_path / 'rate_limit.sqlite'),
+                                               probe_burst=fast_f1_resource.PROBE_CALLS)
+    assert resource.probe_session(2024, 1, 'Q') == probe
+    assert resource._rate_limit().available() == resource.api_burst
+
+    # Once the probe bucket is empty a sensor tick fails fast instead of waiting for tokens
+    with pytest.raises(RateLimitTimeout):
+        resource.probe_session(2024, 1, 'Q')
+
+
+def test_session_list_is_recorded_and_replayed(tmp_path, monkeypatch):
+    sessions = ['Practice 1', 'Sprint Qualifying', 'Sprint', 'Qualifying', 'Race']
+    monkeypatch.setattr(FastF1Client, 'get_session_list', lambda self, year, round_number: sessions)
+    replay_loc = str(tmp_path / 'replay')
+
+    recorder = fast_f1_resource.FastF1Resource(cache_loc=str(tmp_path), mode='record', replay_loc=replay_loc)
+    assert recorder.get_session_list(2024, 5) == sessions
+
+    monkeypatch.undo()
+    replayer = fast_f1_resource.FastF1Resource(cache_loc=str(tmp_path), mode='replay', replay_loc=replay_loc,
+                                               replay_latency_scale=0.0)
+    assert replayer.get_session_list(2024, 5) == sessions
+    with pytest.raises(FileNotFoundError):
+        replayer.get_session_list(2024, 6)
+
+
+def test_replay_latency_is_scaled_or_overridden(tmp_path, monkeypatch):
+    archive = fast_f1_replay.ReplayArchive(str(tmp_path))
+    archive.record(pd.DataFrame({'sessions': ['Race']}), 'get_session_list', latency_ms=200.0, year=2024,
+                   round_number=1)
+    sleeps = list()
+    monkeypatch.setattr(fast_f1_replay.time, 'sleep', sleeps.append)
+
+    fast_f1_replay.FastF1ReplayClient(archive, latency_scale=0.5).get_session_list(2024, 1)
+    fast_f1_replay.FastF1ReplayClient(archive, latency_ms=20.0).get_session_list(2024, 1)
+    assert sleeps == [0.1, 0.02]
+
+
+def test_lake_is_shared_by_session_abbreviations_and_names(tmp_path, monkeypatch):
+    lake = SessionLake(str(tmp_path / 'lake'))
+    laps = pd.DataFrame({column: [1] for column in RACE_LAP_COLUMNS})
+    lake.write(2024, 1, 'Practice 1', {'laps': laps})
+    assert os.listdir(os.path.dirname(lake._path(2024, 1, 'Practice 1', 'laps'))) == ['laps.parquet']
+
+    client = FastF1Client(cache_loc=str(tmp_path), lake=lake)
+    monkeypatch.setattr(client, '_load_session', lambda **kwargs: pytest.fail('FP1 should be read from the lake'))
+    pd.testing.assert_frame_equal(client.get_session_laps(2024, 1, 'FP1'), laps)
+    assert fast_f1_resource.session_name(2022, 'sq') == 'Sprint'
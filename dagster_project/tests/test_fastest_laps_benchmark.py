@@ -0,0 +1,68 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+pytest.importorskip('fastf1')
+pytest.importorskip('dagster')
+
+import time
+from fastf1.core import Laps
+from resources.fast_f1_resource import FastF1Client
+
+DRIVERS = 20
+LAPS_PER_DRIVER = 75
+
+
+class PracticeSession:
+    # A 20 driver, 1,500 lap practice session with a personal best flag on each driver's improving laps
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.drivers = [str(number) for number in range(1, DRIVERS + 1)]
+        frames = list()
+        for number in self.drivers:
+            lap_times = pd.to_timedelta(rng.normal(92, 1.5, LAPS_PER_DRIVER), unit='s')
+            frame = pd.DataFrame({'Driver': f'D{number:0>2}',
+                                  'DriverNumber': number,
+                                  'Team': 'Team',
+                                  'LapNumber': np.arange(1, LAPS_PER_DRIVER + 1),
+                                  'LapTime': lap_times,
+                                  'Sector1Time': lap_times * 0.3,
+                                  'Sector2Time': lap_times * 0.4,
+                                  'Sector3Time': lap_times * 0.3})
+            frame.loc[rng.random(LAPS_PER_DRIVER) < 0.1, 'LapTime'] = pd.NaT
+            frame['IsPersonalBest'] = frame['LapTime'] == frame['LapTime'].cummin()
+            frames.append(frame)
+        self.laps = Laps(pd.concat(frames, ignore_index=True))
+
+
+def per_driver_fastest_laps(session) -> pd.DataFrame:
+    # The loop _fastest_laps replaced, one pick_drivers().pick_fastest() scan of the laps per driver
+    fastest_laps = list()
+    for driver in session.drivers:
+        lap = session.laps.pick_drivers(driver).pick_fastest()
+        if lap is not None:
+            fastest_laps.append(lap)
+    return Laps(fastest_laps).sort_values(by='LapTime').reset_index(drop=True)
+
+
+def best_of(func, session, repeat: int = 5) -> float:
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(session)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_fastest_laps_benchmark():
+    session = PracticeSession()
+
+    expected = per_driver_fastest_laps(session)
+    actual = FastF1Client._fastest_laps(session)
+    pd.testing.assert_frame_equal(actual[['Driver', 'LapTime']], expected[['Driver', 'LapTime']])
+
+    loop_s = best_of(per_driver_fastest_laps, session)
+    grouped_s = best_of(FastF1Client._fastest_laps, session)
+    print(f'\n_fastest_laps on {DRIVERS} drivers x {LAPS_PER_DRIVER} laps: per driver loop {loop_s * 1000:.1f}ms, '
+          f'groupby/idxmin {grouped_s * 1000:.1f}ms ({loop_s / grouped_s:.1f}x)')
+    assert grouped_s < loop_s
@@ -0,0 +1,99 @@
+import time
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dagster import Failure, MetadataValue
+
+
+def _run_work_item(resource_config: dict, method: str, kwargs: dict):
+    # Runs in the worker process, so the resource is rebuilt from its config rather than pickled
+    from resources.fast_f1_resource import FastF1Resource
+
+    start = time.perf_counter()
+    df = getattr(FastF1Resource(**resource_config), method)(**kwargs)
+    return df, time.perf_counter() - start
+
+
+class BackfillUtils:
+    @staticmethod
+    def work_item(name: str, method: str, kwargs: dict, **columns) -> dict:
+        return {'name': name, 'method': method, 'kwargs': kwargs, 'columns': columns}
+
+    @staticmethod
+    def run(context, work_items: list, resource) -> tuple:
+        max_workers = resource.backfill_workers
+        submit_interval = resource.backfill_submit_interval
+
+        context.log.info(f'Running {len(work_items)} work items on {max_workers} processes')
+
+        # Only the first wave is staggered so the workers do not start in lockstep, after that the shared rate limit
+        # paces their api calls
+        futures = list()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for i, item in enumerate(work_items):
+                futures.append(executor.submit(_run_work_item, resource.dict(), item['method'], item['kwargs']))
+                if i < max_workers - 1:
+                    time.sleep(submit_interval)
+
+            frames = list()
+            timings = list()
+            for item, future in zip(work_items, futures):
+                try:
+                    df, seconds = future.result()
+                    frames.append(df.assign(**item['columns']))
+                    timings.append({'ITEM': item['name'], 'STATUS': 'Success', 'SECONDS': round(seconds, 2),
+                                    'ROWS': len(df)})
+                    context.log.info(f"Loaded {item['name']} in {seconds:.2f}s")
+                except Exception as err:
+                    timings.append({'ITEM': item['name'], 'STATUS': f'Failed: {err}', 'SECONDS': None, 'ROWS': 0})
+                    context.log.error(f"Failed to load {item['name']}: {err}")
+
+        timings = pd.DataFrame(timings, columns=['ITEM', 'STATUS', 'SECONDS', 'ROWS'])
+        failed = timings[timings['STATUS'] != 'Success']
+        if len(failed) > 0:
+            raise Failure(description=f'{len(failed)} of {len(work_items)} backfill work items failed',
+                          metadata={'Failures': MetadataValue.md(failed.to_markdown()),
+                                    'Timings': MetadataValue.md(timings.to_markdown())})
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return df, timings
+
+    @staticmethod
+    def iter_results(context, work_items: list, resource):
+        max_workers = resource.backfill_workers
+        submit_interval = resource.backfill_submit_interval
+
+        context.log.info(f'Streaming {len(work_items)} work items on {max_workers} processes')
+
+        # At most max_workers results are in flight, so memory stays bounded however long the backfill is
+        items = iter(work_items)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            def submit():
+                item = next(items, None)
+                if item is not None:
+                    pending.append((item, executor.submit(_run_work_item, resource.dict(), item['method'],
+                                                          item['kwargs'])))
+
+            # Only the first wave is staggered, after that the shared rate limit paces the workers
+            for i in range(max_workers):
+                if i > 0:
+                    time.sleep(submit_interval)
+                submit()
+
+            while pending:
+                item, future = pending.popleft()
+                try:
+                    df, seconds = future.result()
+                except Exception as err:
+                    raise Failure(description=f"Backfill work item {item['name']} failed: {err}")
+                submit()
+                context.log.info(f"Loaded {item['name']} in {seconds:.2f}s")
+                yield df.assign(**item['columns'])
+
+    @staticmethod
+    def timing_metadata(timings: pd.DataFrame) -> dict:
+        return {'Timings': MetadataValue.md(timings.to_markdown()),
+                'Work Items': len(timings),
+                'Total Load Seconds': float(timings['SECONDS'].sum()),
+                'Slowest Item': timings.loc[timings['SECONDS'].idxmax(), 'ITEM'] if len(timings) else ''}
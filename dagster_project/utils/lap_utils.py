@@ -0,0 +1,56 @@
+import pandas as pd
+
+# FastF1 lap columns to the SESSION.*_LAPS table columns, shared by the race, qualifying and practice lap tables
+LAP_COLUMN_MAP = {'LapNumber': 'LAP_NUMBER',
+                  'CONSTRUCTOR_ID': 'TEAM_ID',
+                  'Stint': 'STINT_NUMBER',
+                  'LapTime': 'LAPTIME',
+                  'Sector1Time': 'SECTOR1_TIME',
+                  'Sector2Time': 'SECTOR2_TIME',
+                  'Sector3Time': 'SECTOR3_TIME',
+                  'SpeedI1': 'SPEED_TRAP_1',
+                  'SpeedI2': 'SPEED_TRAP_2',
+                  'SpeedFL': 'SPEED_TRAP_FLAG',
+                  'SpeedST': 'SPEED_TRAP_STRAIGHT',
+                  'Compound': 'COMPOUND',
+                  'TyreLife': 'TYRE_LIFE',
+                  'LapStartDate': 'LAP_START_DATETIME',
+                  'TrackStatus': 'TRACK_STATUS',
+                  'Position': 'POSITION',
+                  'Deleted': 'LAP_DELETED',
+                  'DeletedReason': 'LAP_DELETED_REASON',
+                  'IsAccurate': 'FF1_LAP_IS_ACCURATE'}
+
+
+class LapUtils:
+    @staticmethod
+    def clean_laps(df: pd.DataFrame,
+                   driver_df: pd.DataFrame,
+                   team_df: pd.DataFrame) -> pd.DataFrame:
+        # Merging Team and Driver dfs with data df
+        df = pd.merge(df, driver_df, how='left', left_on='Driver', right_on='DRIVER_CODE')
+        df = pd.merge(df, team_df, how='left', left_on='Team', right_on='NAME')
+
+        df['PIT_IN_FLG'] = (~df['PitInTime'].isna()).astype(int)
+        df['PIT_OUT_FLG'] = (~df['PitOutTime'].isna()).astype(int)
+
+        # Set all the time columns to be seconds
+        for col in ['LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']:
+            df[col] = df[col].dt.total_seconds()
+
+        df['Deleted'] = df['Deleted'].astype(int)
+        df['IsAccurate'] = df['IsAccurate'].astype(int)
+        df['TrackStatus'] = df['TrackStatus'].replace('', -2)
+
+        df = df.drop(columns=['Driver',
+                              'Team',
+                              'DRIVER_CODE',
+                              'NAME',
+                              'QUALI_CD',
+                              'DRIVER_NUMBER',
+                              'PitInTime',
+                              'PitOutTime'])
+        df = df.rename(columns=LAP_COLUMN_MAP)
+
+        # Laps without a time (in/out laps cut short, red flags) are not stored
+        return df.dropna(subset=['LAPTIME'])
@@ -0,0 +1,28 @@
+import datetime
+import pandas as pd
+
+# FastF1 weather columns to the WEATHER.SESSION_WEATHER table columns
+SESSION_WEATHER_COLUMN_MAP = {'WeatherDate': 'WEATHER_DATETIME',
+                              'AirTemp': 'AIR_TEMP',
+                              'TrackTemp': 'TRACK_TEMP',
+                              'Humidity': 'HUMIDITY',
+                              'Pressure': 'PRESSURE',
+                              'Rainfall': 'RAINFALL',
+                              'WindDirection': 'WIND_DIRECTION',
+                              'WindSpeed': 'WIND_SPEED'}
+
+
+class WeatherUtils:
+    @staticmethod
+    def clean_session_weather(df: pd.DataFrame,
+                              year: int,
+                              round_number: int,
+                              session_cd: int) -> pd.DataFrame:
+        df = df.rename(columns=SESSION_WEATHER_COLUMN_MAP)
+        df['SESSION_CD'] = session_cd
+        df['EVENT_CD'] = int(str(year) + str(round_number))
+        df['RAINFALL'] = df['RAINFALL'].astype(int)
+
+        df = df[['EVENT_CD', 'SESSION_CD', 'WEATHER_DATETIME', 'AIR_TEMP', 'TRACK_TEMP', 'HUMIDITY', 'PRESSURE',
+                 'RAINFALL', 'WIND_DIRECTION', 'WIND_SPEED']]
+        return df.dropna(how='any').assign(LOAD_TS=datetime.datetime.now())
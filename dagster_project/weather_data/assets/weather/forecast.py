@@ -1,5 +1,5 @@
 import json
-from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from dagster import asset, Output, MetadataValue
 import os
 import pandas as pd
 from resources.sql_io_manager import MySQLDirectConnection
@@ -131,39 +131,14 @@ def get_weather_forecast_data(context, get_calender_locations_sql: pd.DataFrame)
         }
     )
 
-@asset(required_resource_keys={"mysql"},
-       partitions_def=daily_partitions)
-def weather_forecast_cleanup(context: AssetExecutionContext, get_weather_forecast_data: pd.DataFrame):
-    df = get_weather_forecast_data
-
-    query = f'''
-    DELETE 
-    FROM WEATHER.WEATHER_FORECAST 
-    WHERE 
-        date(FCST_DATETIME) IN {tuple(set(df.utc_datetime.dt.strftime('%Y-%m-%d')))}
-    '''
-
-    context.log.info(query)
-
-    with context.resources.mysql.get_connection() as conn:
-        conn.cursor().execute(query)
-        conn.commit()
-
-    return Output(
-        value=df,
-        metadata={
-            'Markdown': MetadataValue.md(df.head().to_markdown()),
-            'Rows': len(df),
-        }
-    )
-
-
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['WEATHER', 'WEATHER_FORECAST', 'append'],
-       partitions_def=daily_partitions)
-def weather_forecast_to_sql(context, weather_forecast_cleanup: pd.DataFrame):
+       key_prefix=['WEATHER', 'WEATHER_FORECAST', 'partition'],
+       partitions_def=daily_partitions,
+       metadata={'partition_column': 'FCST_DATETIME',
+                 'partition_days': 7})
+def weather_forecast_to_sql(context, get_weather_forecast_data: pd.DataFrame):
     load_date = datetime.today()
-    df = weather_forecast_cleanup
+    df = get_weather_forecast_data
     df.rename(columns={'FCST_LOCATION': 'FCST_LOCATION',
                        'utc_datetime': 'FCST_DATETIME',
                        'temp': 'TEMPERATURE',
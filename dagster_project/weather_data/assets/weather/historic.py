@@ -1,4 +1,4 @@
-from dagster import asset, Output, MetadataValue, AssetExecutionContext
+from dagster import asset, Output, MetadataValue
 import os
 import pandas as pd
 from utils.file_utils import FileUtils
@@ -211,36 +211,9 @@ def get_weather_historic_data(context, get_calender_locations_sql_historic: pd.D
         }
     )
 
-@asset(required_resource_keys={"mysql"},
-       partitions_def=daily_partitions)
-def weather_historical_cleanup(context: AssetExecutionContext, get_weather_historic_data: pd.DataFrame):
-    df = get_weather_historic_data
-    partition_date_str = context.partition_key
-    partition_date = datetime.strptime(partition_date_str, '%Y-%m-%d').date()
-
-    query = f'''
-    DELETE FROM WEATHER.WEATHER_HISTORIC 
-    WHERE 
-        date(FCST_DATETIME) = '{partition_date.strftime("%Y-%m-%d")}'
-    '''
-
-    context.log.info(query)
-
-    with context.resources.mysql.get_connection() as conn:
-        conn.cursor().execute(query)
-        conn.commit()
-
-    return Output(
-        value=df,
-        metadata={
-            'Markdown': MetadataValue.md(df.head().to_markdown()),
-            'Rows': len(df),
-        }
-    )
-
-
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['WEATHER', 'WEATHER_HISTORIC', 'cleanup'])
+       key_prefix=['WEATHER', 'WEATHER_HISTORIC', 'swap'],
+       metadata={'write_strategy': 'bulk'})
 def full_weather_historic_to_sql(context, get_full_weather_historic_data: pd.DataFrame):
     load_date = datetime.today()
     df = get_full_weather_historic_data
@@ -265,11 +238,13 @@ def full_weather_historic_to_sql(context, get_full_weather_historic_data: pd.Dat
 
 
 @asset(io_manager_key='sql_io_manager',
-       key_prefix=['WEATHER', 'WEATHER_HISTORIC', 'append'],
-       partitions_def=daily_partitions)
-def weather_historic_to_sql(context, weather_historical_cleanup: pd.DataFrame):
+       key_prefix=['WEATHER', 'WEATHER_HISTORIC', 'partition'],
+       partitions_def=daily_partitions,
+       metadata={'write_strategy': 'multi',
+                 'partition_column': 'FCST_DATETIME'})
+def weather_historic_to_sql(context, get_weather_historic_data: pd.DataFrame):
     load_date = datetime.today()
-    df = weather_historical_cleanup
+    df = get_weather_historic_data
     df.rename(columns={'FCST_LOCATION': 'FCST_LOCATION',
                        'utc_datetime': 'FCST_DATETIME',
                        'temp': 'TEMPERATURE',
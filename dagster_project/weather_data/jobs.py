@@ -20,7 +20,6 @@ year_list = [i for i in range(first_year, last_year + 1, 1)]
 weather_forecast_data_load_job = define_asset_job('load_weather_forecast_data_job',
                                                   selection=AssetSelection.assets(get_calender_locations_sql,
                                                                                   get_weather_forecast_data,
-                                                                                  weather_forecast_cleanup,
                                                                                   weather_forecast_to_sql),
                                                   description='Job to upload the weather forecast')
 
@@ -40,7 +39,6 @@ load_weather_historic_data_job = define_asset_job('load_weather_historic_data_jo
                                                        selection=AssetSelection.assets(
                                                            get_calender_locations_sql_historic,
                                                            get_weather_historic_data,
-                                                           weather_historical_cleanup,
                                                            weather_historic_to_sql
                                                        ),
                                                        description='Job to upload the partition date historic weather',